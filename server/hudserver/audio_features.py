@@ -1,34 +1,114 @@
 from __future__ import annotations
 
+import collections
+import functools
+import math
+
 import numpy as np
 
 
-def pcm16le_bytes_to_float32(pcm: bytes) -> np.ndarray:
-    """Convert PCM s16le bytes to float32 in [-1, 1]."""
+def pcm16le_bytes_to_float32(pcm: bytes, out: np.ndarray | None = None) -> np.ndarray:
+    """Convert PCM s16le bytes to float32 in [-1, 1].
+
+    If ``out`` is a float32 array large enough for the frame, the samples are
+    written into it and a view of the first ``n`` elements is returned; the view
+    is only valid until ``out`` is reused.
+    """
     if not pcm:
         return np.zeros((0,), dtype=np.float32)
-    s16 = np.frombuffer(pcm, dtype=np.int16)
-    return (s16.astype(np.float32) / 32768.0).copy()
+    s16 = np.frombuffer(pcm, dtype=np.int16, count=len(pcm) // 2)
+    if out is not None and out.dtype == np.float32 and out.size >= s16.size:
+        buf = out[: s16.size]
+    else:
+        buf = np.empty((s16.size,), dtype=np.float32)
+    np.multiply(s16, np.float32(1.0 / 32768.0), out=buf)
+    return buf
 
 
 def rms(samples: np.ndarray) -> float:
     if samples.size == 0:
         return 0.0
-    return float(np.sqrt(np.mean(samples * samples)))
+    # Single pass, no squared temporary.
+    return math.sqrt(float(np.dot(samples, samples)) / samples.size)
 
 
-def band_power_ratio(samples: np.ndarray, sample_rate_hz: int, band_hz: tuple[float, float]) -> float:
-    """Return band power / total power for the provided samples."""
-    if samples.size == 0:
-        return 0.0
-    window = np.hanning(samples.size).astype(np.float32)
-    x = samples * window
-    spec = np.fft.rfft(x)
-    power = (spec.real * spec.real + spec.imag * spec.imag).astype(np.float32)
-    total = float(np.sum(power)) + 1e-12
-    freqs = np.fft.rfftfreq(samples.size, d=1.0 / sample_rate_hz)
-    lo, hi = band_hz
-    mask = (freqs >= lo) & (freqs <= hi)
-    band = float(np.sum(power[mask]))
-    return band / total
+@functools.lru_cache(maxsize=8)
+def _hann_window(size: int) -> np.ndarray:
+    window = np.hanning(size).astype(np.float32)
+    window.flags.writeable = False
+    return window
+
+
+@functools.lru_cache(maxsize=16)
+def _band_bins(size: int, sample_rate_hz: int, bands: tuple[tuple[float, float], ...]) -> tuple[slice, ...]:
+    bins_per_hz = size / float(sample_rate_hz)
+    n_bins = size // 2 + 1
+    out: list[slice] = []
+    for lo, hi in bands:
+        lo_bin = max(0, math.ceil(lo * bins_per_hz))
+        hi_bin = min(n_bins - 1, math.floor(hi * bins_per_hz))
+        out.append(slice(lo_bin, max(lo_bin, hi_bin + 1)))
+    return tuple(out)
+
+
+class BandEnergyWindow:
+    """Sliding window of per-frame energies for streaming band-ratio detection.
+
+    Each pushed frame is transformed once (Hann + rFFT over the frame only) and
+    reduced to (sum of squares, total power, band powers...). The window keeps
+    running sums of those rows and subtracts them again when a frame is evicted,
+    so reading the current RMS / band ratios never touches the raw samples.
+    """
+
+    def __init__(self, sample_rate_hz: int, window_samples: int, bands: tuple[tuple[float, float], ...]) -> None:
+        self._sample_rate_hz = int(sample_rate_hz)
+        self._window_samples = int(window_samples)
+        self._bands = tuple((float(lo), float(hi)) for lo, hi in bands)
+        self._rows: collections.deque[tuple[int, np.ndarray]] = collections.deque()
+        self._sums = np.zeros((2 + len(self._bands),), dtype=np.float64)
+        self._samples = 0
+        self._pushes_since_resync = 0
+
+    @property
+    def filled(self) -> bool:
+        return self._samples >= self._window_samples
+
+    def clear(self) -> None:
+        self._rows.clear()
+        self._sums[:] = 0.0
+        self._samples = 0
+        self._pushes_since_resync = 0
+
+    def push(self, frame: np.ndarray) -> None:
+        if frame.size == 0:
+            return
+        spec = np.fft.rfft(frame * _hann_window(frame.size))
+        power = spec.real * spec.real + spec.imag * spec.imag
+        row = np.empty_like(self._sums)
+        row[0] = float(np.dot(frame, frame))
+        row[1] = float(np.sum(power))
+        for i, band in enumerate(_band_bins(frame.size, self._sample_rate_hz, self._bands)):
+            row[2 + i] = float(np.sum(power[band]))
+
+        self._rows.append((int(frame.size), row))
+        self._sums += row
+        self._samples += int(frame.size)
+        while self._rows and self._samples - self._rows[0][0] >= self._window_samples:
+            size, old = self._rows.popleft()
+            self._sums -= old
+            self._samples -= size
+
+        # Re-sum from scratch once per window's worth of frames to bound float drift.
+        self._pushes_since_resync += 1
+        if self._pushes_since_resync >= len(self._rows):
+            self._pushes_since_resync = 0
+            self._sums = np.sum([r for _, r in self._rows], axis=0)
+
+    def rms(self) -> float:
+        if self._samples == 0:
+            return 0.0
+        return math.sqrt(max(0.0, float(self._sums[0])) / self._samples)
 
+    def band_ratios(self) -> tuple[float, ...]:
+        total = max(0.0, float(self._sums[1])) + 1e-12
+        return tuple(max(0.0, float(b)) / total for b in self._sums[2:])
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import asyncio
 import base64
-import json
 import logging
 import os
 import ssl
@@ -12,6 +11,8 @@ from typing import Any, AsyncIterator, Awaitable, Callable
 import certifi
 import websockets
 
+from hudserver.protocol import dumps, loads
+
 
 @dataclass(frozen=True, slots=True)
 class ElevenLabsConfig:
@@ -87,14 +88,14 @@ class ElevenLabsRealtimeStt:
                         "commit": False,
                         "sample_rate": sample_rate_hz,
                     }
-                    await ws.send(json.dumps(payload, separators=(",", ":")))
+                    await ws.send(dumps(payload))
 
             async def receiver() -> None:
                 async for msg in ws:
                     if not isinstance(msg, str):
                         continue
                     try:
-                        obj = json.loads(msg)
+                        obj = loads(msg)
                     except Exception:
                         continue
                     await on_message(obj)
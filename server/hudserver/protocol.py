@@ -4,6 +4,11 @@ import json
 from dataclasses import dataclass
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the stdlib encoder.
+    orjson = None
+
 
 @dataclass(frozen=True, slots=True)
 class ClientHello:
@@ -12,9 +17,26 @@ class ClientHello:
 
 
 def dumps(obj: Any) -> str:
+    if orjson is not None:
+        # Same compact, non-ASCII-escaped output as the json path; returned as str so it
+        # is still sent as a text frame.
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode("utf-8")
     return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
 
 
-def loads(text: str) -> Any:
+def dumps_utf8(obj: Any) -> bytes:
+    """Like ``dumps`` but returns UTF-8 bytes, for sending one encoded payload to many clients.
+
+    Send with ``conn.send(payload, text=True)`` so it still goes out as a text frame.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def loads(text: str | bytes) -> Any:
+    if orjson is not None:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch the same errors.
+        return orjson.loads(text)
     return json.loads(text)
 
@@ -1,22 +1,36 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
+import math
 import os
-from collections import deque
+import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Awaitable, Callable, Mapping
 from urllib.parse import parse_qs, urlparse, urlunparse
 
 import numpy as np
 import websockets
-from websockets.asyncio.server import ServerConnection
+from websockets.asyncio.server import ServerConnection, broadcast
 
-from hudserver.audio_features import band_power_ratio, pcm16le_bytes_to_float32, rms as rms_value
+from hudserver.audio_features import BandEnergyWindow, pcm16le_bytes_to_float32, rms as rms_value
+from hudserver.elevenlabs_stt import ElevenLabsConfig, ElevenLabsRealtimeStt
 from hudserver.external_haptics import ExternalHapticsClient
 from hudserver.logging_utils import setup_logging
-from hudserver.protocol import dumps, loads
-from hudserver.elevenlabs_stt import ElevenLabsConfig, ElevenLabsRealtimeStt
+from hudserver.protocol import dumps, dumps_utf8, loads
+
+try:
+    import ahocorasick  # type: ignore
+except ImportError:  # Optional: keyword matching falls back to substring scans.
+    ahocorasick = None
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_GLOW_EDGES = ("top", "right", "bottom", "left")
+# Skip periodic telemetry for an /events client with this much unsent data (a stalled reader).
+_EVENTS_MAX_WRITE_BUFFER = 64 * 1024
 
 
 def _parse_bool(raw: str | None, default: bool = False) -> bool:
@@ -25,6 +39,54 @@ def _parse_bool(raw: str | None, default: bool = False) -> bool:
     return raw.strip().lower() in ("1", "true", "yes", "on")
 
 
+def _clamp(value: float, lo: float, hi: float) -> float:
+    """Scalar clamp; cheaper than np.clip for plain Python floats."""
+    return lo if value < lo else hi if value > hi else value
+
+
+def _drain_queue(q: _FrameReader, first: bytes, limit: int = 16) -> list[bytes]:
+    """Return ``first`` plus whatever is already queued (up to ``limit`` items) without awaiting."""
+    items = [first]
+    while len(items) < limit:
+        try:
+            items.append(q.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+    return items
+
+
+async def _fixed_rate_ticker(interval_s: float) -> AsyncIterator[float]:
+    """Yield the loop time every ``interval_s`` seconds on a fixed schedule.
+
+    Sleeps until the next scheduled tick rather than a fixed interval after the
+    previous body finished, so the rate does not drift. If the consumer falls
+    more than two ticks behind, the schedule is re-anchored instead of bursting.
+    """
+    loop = asyncio.get_running_loop()
+    next_tick = loop.time()
+    while True:
+        next_tick += interval_s
+        delay = next_tick - loop.time()
+        if delay < -2.0 * interval_s:
+            next_tick = loop.time()
+            delay = 0.0
+        await asyncio.sleep(max(0.0, delay))
+        yield loop.time()
+
+
+@functools.lru_cache(maxsize=4)
+def _radar_fft_setup(
+    n: int, sample_rate_hz: int, min_freq_hz: float, max_freq_hz: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Hann window, rFFT bin frequencies and in-band bin indices for an n-sample radar window."""
+    window = np.hanning(n).astype(np.float32)
+    freqs = np.fft.rfftfreq(n, d=1.0 / sample_rate_hz)
+    idx = np.where((freqs >= min_freq_hz) & (freqs <= max_freq_hz))[0]
+    for arr in (window, freqs, idx):
+        arr.flags.writeable = False
+    return window, freqs, idx
+
+
 def _ensure_ws_port(url: str, default_port: int) -> str:
     """If URL has no explicit port, add default_port."""
     u = (url or "").strip()
@@ -59,8 +121,10 @@ class Esp32AudioState:
     channels: int
     frame_ms: int
     bytes_per_frame: int
-    stt_q: asyncio.Queue[bytes]
-    analysis_q: asyncio.Queue[bytes]
+    frames: _FrameRing
+    stt_q: _FrameReader
+    analysis_q: _FrameReader
+    rms_q: _FrameReader
     last_rms: float
     last_seen_monotonic: float
     dropped_frames: int
@@ -99,8 +163,9 @@ class AndroidMicState:
     frame_ms: int
     bytes_per_frame: int
     mono_bytes_per_frame: int
-    stt_q: asyncio.Queue[bytes]
-    analysis_q: asyncio.Queue[bytes]
+    frames: _FrameRing
+    stt_q: _FrameReader
+    analysis_q: _FrameReader
     last_rms: float
     last_rms_left: float
     last_rms_right: float
@@ -117,33 +182,158 @@ class RadarTrack:
     last_seen_monotonic: float
 
 
+class _FrameRing:
+    """Bounded frame buffer with one producer and independent drop-oldest readers.
+
+    Frames are immutable ``bytes``, so slots hold references (no copies). ``push``
+    stores a frame once however many consumers there are; each consumer reads
+    through its own ``_FrameReader`` cursor.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self._slots: list[bytes | None] = [None] * max(1, int(capacity))
+        self._written = 0  # total frames pushed
+        self._readers: list[_FrameReader] = []
+
+    def reader(self, max_backlog: int | None = None) -> _FrameReader:
+        """Create a cursor starting at the next pushed frame.
+
+        A reader keeps at most ``max_backlog`` (default: ring capacity) unread frames;
+        older ones are skipped, i.e. drop-oldest per consumer.
+        """
+        backlog = len(self._slots) if max_backlog is None else max(1, min(int(max_backlog), len(self._slots)))
+        r = _FrameReader(self, backlog)
+        self._readers.append(r)
+        return r
+
+    def push(self, frame: bytes) -> None:
+        self._slots[self._written % len(self._slots)] = frame
+        self._written += 1
+        for r in self._readers:
+            r._ready.set()
+
+
+class _FrameReader:
+    """One consumer's cursor into a ``_FrameRing`` (queue-like get/get_nowait/qsize)."""
+
+    def __init__(self, ring: _FrameRing, max_backlog: int) -> None:
+        self._ring = ring
+        self._max_backlog = max_backlog
+        self._next = ring._written
+        self._ready = asyncio.Event()
+
+    def qsize(self) -> int:
+        return min(self._ring._written - self._next, self._max_backlog)
+
+    def full(self) -> bool:
+        return self._ring._written - self._next >= self._max_backlog
+
+    def get_nowait(self) -> bytes:
+        ring = self._ring
+        backlog = ring._written - self._next
+        if backlog <= 0:
+            raise asyncio.QueueEmpty
+        if backlog > self._max_backlog:
+            self._next = ring._written - self._max_backlog
+        frame = ring._slots[self._next % len(ring._slots)]
+        self._next += 1
+        assert frame is not None
+        return frame
+
+    async def get(self) -> bytes:
+        while self._ring._written == self._next:
+            self._ready.clear()
+            await self._ready.wait()
+        return self.get_nowait()
+
+    async def get_within(self, timeout_s: float) -> bytes | None:
+        """Like ``get`` but returns None after ``timeout_s`` without a frame.
+
+        Cheaper than ``asyncio.wait_for(reader.get(), ...)``: frames already queued are
+        returned immediately, and otherwise the wait is a single timer that wakes the
+        same Event (no wrapper task).
+        """
+        if self._ring._written == self._next:
+            self._ready.clear()
+            timer = asyncio.get_running_loop().call_later(timeout_s, self._ready.set)
+            try:
+                await self._ready.wait()
+            finally:
+                timer.cancel()
+            if self._ring._written == self._next:
+                return None
+        return self.get_nowait()
+
+
 class _SampleRing:
-    def __init__(self, max_samples: int) -> None:
+    """Fixed-size float32 ring buffer holding the most recent ``max_samples`` samples.
+
+    Samples are copied into a preallocated array on append, so steady-state
+    appends never allocate and callers may reuse their input buffers. With
+    ``track_energy`` the ring also keeps a running sum of squares (add on write,
+    subtract the overwritten samples) so ``rms()`` does not re-read the window.
+    """
+
+    def __init__(self, max_samples: int, *, track_energy: bool = False) -> None:
         self._max_samples = max(0, int(max_samples))
-        self._parts: deque[np.ndarray] = deque()
-        self._total_samples = 0
+        self._buf = np.zeros((self._max_samples,), dtype=np.float32)
+        self._write_pos = 0
+        self._filled = 0
+        self._track_energy = bool(track_energy)
+        self._sum_sq = 0.0
+        self._samples_since_resync = 0
+
+    def __len__(self) -> int:
+        return self._filled
 
     def append(self, samples: np.ndarray) -> None:
         if self._max_samples <= 0:
             return
         if samples.size == 0:
             return
-        if samples.dtype != np.float32:
-            samples = samples.astype(np.float32, copy=False)
         if samples.size > self._max_samples:
             samples = samples[-self._max_samples :]
-        self._parts.append(samples)
-        self._total_samples += int(samples.size)
-        while self._total_samples > self._max_samples and self._parts:
-            popped = self._parts.popleft()
-            self._total_samples -= int(popped.size)
+        n = int(samples.size)
+        end = self._write_pos + n
+        if end <= self._max_samples:
+            if self._track_energy:
+                old = self._buf[self._write_pos : end]
+                self._sum_sq += float(np.dot(samples, samples)) - float(np.dot(old, old))
+            self._buf[self._write_pos : end] = samples
+        else:
+            split = self._max_samples - self._write_pos
+            if self._track_energy:
+                old_a = self._buf[self._write_pos :]
+                old_b = self._buf[: end - self._max_samples]
+                self._sum_sq += float(np.dot(samples, samples)) - float(np.dot(old_a, old_a)) - float(np.dot(old_b, old_b))
+            self._buf[self._write_pos :] = samples[:split]
+            self._buf[: end - self._max_samples] = samples[split:]
+        self._write_pos = end % self._max_samples
+        self._filled = min(self._filled + n, self._max_samples)
+
+        if self._track_energy:
+            # Recompute from scratch every ~10 windows to bound float drift.
+            self._samples_since_resync += n
+            if self._samples_since_resync >= 10 * self._max_samples:
+                self._samples_since_resync = 0
+                self._sum_sq = float(np.dot(self._buf, self._buf))
+            elif self._sum_sq < 0.0:
+                self._sum_sq = 0.0
+
+    def rms(self) -> float:
+        """RMS of the buffered samples (requires ``track_energy=True``)."""
+        if self._filled <= 0:
+            return 0.0
+        return math.sqrt(self._sum_sq / self._filled)
 
     def get(self) -> np.ndarray:
-        if self._total_samples <= 0 or not self._parts:
+        """Return a copy of the buffered samples in chronological order."""
+        if self._filled <= 0:
             return np.zeros((0,), dtype=np.float32)
-        if len(self._parts) == 1:
-            return self._parts[0]
-        return np.concatenate(list(self._parts)).astype(np.float32, copy=False)
+        start = self._write_pos - self._filled
+        if start >= 0:
+            return self._buf[start : self._write_pos].copy()
+        return np.concatenate((self._buf[start:], self._buf[: self._write_pos]))
 
 
 class HudServer:
@@ -158,6 +348,14 @@ class HudServer:
         self._android_stt: set[ServerConnection] = set()
         self._android_info: dict[ServerConnection, AndroidClientInfo] = {}
         self._android_mic_by_conn: dict[ServerConnection, AndroidMicState] = {}
+        # path -> handler(conn, raw query string); only the ESP32 endpoint parses its query.
+        self._routes: dict[str, Callable[[ServerConnection, str], Awaitable[None]]] = {
+            "/events": lambda conn, _qs: self._handle_android_events(conn),
+            "/stt": lambda conn, _qs: self._handle_android_stt(conn),
+            "/esp32/audio": lambda conn, qs: self._handle_esp32_audio(conn, parse_qs(qs)),
+        }
+        # Most recently active phone mic (updated on receipt; avoids scanning _android_mic_by_conn per tick).
+        self._latest_android_mic: AndroidMicState | None = None
         self._android_mic_force_channels: int = 2
 
         # STT audio input selection:
@@ -168,6 +366,8 @@ class HudServer:
 
         self._esp32_by_role: dict[str, Esp32AudioState] = {}
         self._head_pose: HeadPoseState | None = None
+        # Bumped whenever an input to the direction estimate changes (mic RMS, poses).
+        self._mic_update_seq: int = 0
         self._torso_pose: TorsoPoseState | None = None
         self._cal_head_yaw0: float | None = None
         self._cal_torso_yaw0: float | None = None
@@ -177,6 +377,8 @@ class HudServer:
         self._smoothed_torso_direction_deg: float | None = None
         self._latest_direction_payload: dict[str, Any] = {}
         self._direction_log_last_s: float = 0.0
+        self._direction_broadcast_key: tuple[Any, ...] | None = None
+        self._direction_broadcast_last_s: float = 0.0
         self._esp32_level_log_last_s: float = 0.0
         self._direction_noise_floor: float = float(os.environ.get("DIRECTION_NOISE_FLOOR", "0.002"))
         self._direction_gain_quad: float = float(os.environ.get("DIRECTION_GAIN_QUAD", "4.5"))
@@ -245,7 +447,12 @@ class HudServer:
         self._radar_seen_bl: float = 0.0
         self._radar_seen_br: float = 0.0
 
+        # Dedicated worker for YAMNet load/inference so it never queues behind (or blocks)
+        # the default executor used for DNS lookups and other to_thread work.
+        self._analysis_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hud-audio")
+
         self._keywords: list[str] = []
+        self._keyword_automaton: Any = None
         self._keyword_cooldown_s: float = float(os.environ.get("KEYWORD_COOLDOWN_S", "5"))
         self._keyword_last_hit: dict[str, float] = {}
 
@@ -282,6 +489,7 @@ class HudServer:
         self._yamnet_horn_hold_s: float = float(os.environ.get("YAMNET_HORN_HOLD_S", "2.0"))
         self._yamnet_siren_hold_s: float = float(os.environ.get("YAMNET_SIREN_HOLD_S", "3.0"))
         self._yamnet_topk: int = int(os.environ.get("YAMNET_TOPK", "5"))
+        self._yamnet_xla: bool = _parse_bool(os.environ.get("YAMNET_XLA"), default=False)
 
         self._alarm_fire_active: bool = False
         self._alarm_horn_active: bool = False
@@ -327,11 +535,9 @@ class HudServer:
         left_level = 0.0
         right_level = 0.0
 
-        mic = None
-        if self._android_mic_by_conn:
-            mic = max(self._android_mic_by_conn.values(), key=lambda s: s.last_seen_monotonic)
-            if (now - mic.last_seen_monotonic) >= 1.0:
-                mic = None
+        mic = self._latest_android_mic
+        if mic is not None and (now - mic.last_seen_monotonic) >= 1.0:
+            mic = None
         if mic is not None:
             left_level += float(max(0.0, mic.last_rms_left))
             right_level += float(max(0.0, mic.last_rms_right))
@@ -366,7 +572,7 @@ class HudServer:
         side = max(1e-3, float(self._array_side_len_mm))
         dx = 0.5 * (front - back)
         depth_sq = (side * side) - (dx * dx)
-        depth = float(np.sqrt(max(1e-6, depth_sq)))
+        depth = math.sqrt(max(1e-6, depth_sq))
         y = 0.5 * depth
         return {
             "bl": (-0.5 * back, -y),
@@ -456,7 +662,15 @@ class HudServer:
         else:
             self._logger.info("Alarm detection disabled (set ALARM_DETECTOR=yamnet or heuristic)")
         try:
-            async with websockets.serve(self._route, self._host, self._port, max_size=2 * 1024 * 1024):
+            # No permessage-deflate: frames are small PCM/JSON messages sent at 20-50 Hz, where zlib
+            # costs CPU and latency for little gain. (asyncio already sets TCP_NODELAY on TCP sockets.)
+            async with websockets.serve(
+                self._route,
+                self._host,
+                self._port,
+                max_size=2 * 1024 * 1024,
+                compression=None,
+            ):
                 await self._stop.wait()
         finally:
             stt_task.cancel()
@@ -476,21 +690,14 @@ class HudServer:
             if alarms_task is not None:
                 tasks.append(alarms_task)
             await asyncio.gather(*tasks, return_exceptions=True)
+            self._analysis_executor.shutdown(wait=False, cancel_futures=True)
 
     async def _route(self, conn: ServerConnection) -> None:
         raw_path = conn.request.path
-        parsed = urlparse(raw_path)
-        path = parsed.path
-        query = parse_qs(parsed.query)
-
-        if path == "/events":
-            await self._handle_android_events(conn)
-            return
-        if path == "/stt":
-            await self._handle_android_stt(conn)
-            return
-        if path == "/esp32/audio":
-            await self._handle_esp32_audio(conn, query)
+        path, _, query_string = raw_path.partition("?")
+        handler = self._routes.get(path)
+        if handler is not None:
+            await handler(conn, query_string)
             return
 
         self._logger.warning("Unknown websocket path %s from %s", raw_path, conn.remote_address)
@@ -499,12 +706,13 @@ class HudServer:
     async def _handle_android_events(self, conn: ServerConnection) -> None:
         self._android_events.add(conn)
         self._logger.info("Android /events connected from %s", conn.remote_address)
+        now_fn = asyncio.get_running_loop().time
         self._android_info[conn] = AndroidClientInfo(
             v=None,
             client=None,
             model=None,
             sdk_int=None,
-            last_seen_monotonic=asyncio.get_running_loop().time(),
+            last_seen_monotonic=now_fn(),
         )
         try:
             await conn.send(dumps({"type": "status", "server": "connected"}))
@@ -523,7 +731,7 @@ class HudServer:
                     continue
                 info = self._android_info.get(conn)
                 if info is not None:
-                    info.last_seen_monotonic = asyncio.get_running_loop().time()
+                    info.last_seen_monotonic = now_fn()
                 msg_type = obj.get("type")
                 if msg_type == "hello":
                     if info is not None:
@@ -551,8 +759,9 @@ class HudServer:
                         yaw_deg=yaw,
                         pitch_deg=pitch,
                         roll_deg=roll,
-                        last_seen_monotonic=asyncio.get_running_loop().time(),
+                        last_seen_monotonic=now_fn(),
                     )
+                    self._mic_update_seq += 1
                 elif msg_type == "torso_pose":
                     try:
                         yaw = float(obj.get("yawDeg", obj.get("yaw")))
@@ -562,10 +771,11 @@ class HudServer:
                         yaw = -yaw
                     self._torso_pose = TorsoPoseState(
                         yaw_deg=yaw,
-                        last_seen_monotonic=asyncio.get_running_loop().time(),
+                        last_seen_monotonic=now_fn(),
                     )
+                    self._mic_update_seq += 1
                 elif msg_type == "calibrate.pose_zero":
-                    now = asyncio.get_running_loop().time()
+                    now = now_fn()
                     head = self._fresh_head_pose(now)
                     torso = self._fresh_torso_pose(now)
                     if head is not None:
@@ -637,16 +847,16 @@ class HudServer:
                         for k in kws:
                             if not isinstance(k, str):
                                 continue
-                            kk = " ".join(k.strip().lower().split())
+                            kk = _WHITESPACE_RE.sub(" ", k.lower()).strip()
                             if kk:
                                 cleaned.append(kk)
-                        self._keywords = cleaned[:50]
+                        self._set_keywords(cleaned[:50])
                 elif msg_type == "audio.source":
                     source = str(obj.get("source") or "").strip().lower()
                     if source in ("auto", "android", "android_mic", "esp32"):
                         self._stt_audio_source = "android_mic" if source == "android" else source
                 elif msg_type == "status.request":
-                    now = asyncio.get_running_loop().time()
+                    now = now_fn()
                     await conn.send(dumps(self._build_status_payload(now)))
         finally:
             self._android_events.discard(conn)
@@ -656,6 +866,7 @@ class HudServer:
     async def _handle_android_stt(self, conn: ServerConnection) -> None:
         self._android_stt.add(conn)
         self._logger.info("Android /stt connected from %s", conn.remote_address)
+        now_fn = asyncio.get_running_loop().time
         try:
             await conn.send(dumps({"type": "status", "stt": "connected"}))
             async for msg in conn:
@@ -689,21 +900,25 @@ class HudServer:
                     samples_per_frame = int(sample_rate_hz * (frame_ms / 1000.0))
                     mono_bytes_per_frame = samples_per_frame * 2
                     bytes_per_frame = mono_bytes_per_frame * channels
-                    self._android_mic_by_conn[conn] = AndroidMicState(
+                    frames = _FrameRing(200)  # ~4s at 20ms frames
+                    mic_state = AndroidMicState(
                         device_id=device_id,
                         sample_rate_hz=sample_rate_hz,
                         channels=channels,
                         frame_ms=frame_ms,
                         bytes_per_frame=bytes_per_frame,
                         mono_bytes_per_frame=mono_bytes_per_frame,
-                        stt_q=asyncio.Queue(maxsize=200),
-                        analysis_q=asyncio.Queue(maxsize=200),
+                        frames=frames,
+                        stt_q=frames.reader(),
+                        analysis_q=frames.reader(),
                         last_rms=0.0,
                         last_rms_left=0.0,
                         last_rms_right=0.0,
-                        last_seen_monotonic=asyncio.get_running_loop().time(),
+                        last_seen_monotonic=now_fn(),
                         dropped_frames=0,
                     )
+                    self._android_mic_by_conn[conn] = mic_state
+                    self._latest_android_mic = mic_state
                     self._logger.info(
                         "Android mic ready deviceId=%s sampleRateHz=%s channels=%s frameMs=%s",
                         device_id,
@@ -724,6 +939,7 @@ class HudServer:
                     frame_ms = 20
                     mono_bytes_per_frame = int(sample_rate_hz * (frame_ms / 1000.0)) * 2
                     bytes_per_frame = mono_bytes_per_frame * channels
+                    frames = _FrameRing(200)  # ~4s at 20ms frames
                     state = AndroidMicState(
                         device_id="android",
                         sample_rate_hz=sample_rate_hz,
@@ -731,17 +947,19 @@ class HudServer:
                         frame_ms=frame_ms,
                         bytes_per_frame=bytes_per_frame,
                         mono_bytes_per_frame=mono_bytes_per_frame,
-                        stt_q=asyncio.Queue(maxsize=200),
-                        analysis_q=asyncio.Queue(maxsize=200),
+                        frames=frames,
+                        stt_q=frames.reader(),
+                        analysis_q=frames.reader(),
                         last_rms=0.0,
                         last_rms_left=0.0,
                         last_rms_right=0.0,
-                        last_seen_monotonic=asyncio.get_running_loop().time(),
+                        last_seen_monotonic=now_fn(),
                         dropped_frames=0,
                     )
                     self._android_mic_by_conn[conn] = state
 
-                state.last_seen_monotonic = asyncio.get_running_loop().time()
+                state.last_seen_monotonic = now_fn()
+                self._latest_android_mic = state
 
                 # Auto-detect mono vs stereo if the client didn't (or couldn't) send a valid audio.hello.
                 # For 16kHz/20ms PCM16:
@@ -765,7 +983,7 @@ class HudServer:
                         state.channels,
                     )
 
-                frame_in = bytes(msg)
+                frame_in = msg if type(msg) is bytes else bytes(msg)
                 frame_out: bytes | None = None
 
                 # Compute RMS and downmix to mono for STT/analysis.
@@ -781,12 +999,18 @@ class HudServer:
                             continue
                         left = left[:n]
                         right = right[:n]
-                        float_left = left.astype(np.float32) / np.float32(32768.0)
-                        float_right = right.astype(np.float32) / np.float32(32768.0)
-                        state.last_rms_left = float(np.sqrt(np.mean(float_left * float_left)))
-                        state.last_rms_right = float(np.sqrt(np.mean(float_right * float_right)))
-                        downmix = 0.5 * (float_left + float_right)
-                        state.last_rms = float(np.sqrt(np.mean(downmix * downmix)))
+                        float_left = left.astype(np.float32)
+                        float_left *= np.float32(1.0 / 32768.0)
+                        float_right = right.astype(np.float32)
+                        float_right *= np.float32(1.0 / 32768.0)
+                        rms_l = rms_value(float_left)
+                        rms_r = rms_value(float_right)
+                        state.last_rms_left = rms_l
+                        state.last_rms_right = rms_r
+                        # RMS of the 0.5*(L+R) downmix from the per-channel energies plus one
+                        # cross dot product, without materialising the downmixed signal.
+                        cross = float(np.dot(float_left, float_right)) / n
+                        state.last_rms = math.sqrt(max(0.0, rms_l * rms_l + rms_r * rms_r + 2.0 * cross) / 4.0)
 
                         self._radar_buf_bl.append(float_left)
                         self._radar_buf_br.append(float_right)
@@ -796,8 +1020,9 @@ class HudServer:
                         mono_i32 = (left.astype(np.int32) + right.astype(np.int32)) // 2
                         frame_out = mono_i32.astype(np.int16).tobytes()
                     else:
-                        float_pcm = pcm.astype(np.float32) / np.float32(32768.0)
-                        state.last_rms = float(np.sqrt(np.mean(float_pcm * float_pcm)))
+                        float_pcm = pcm.astype(np.float32)
+                        float_pcm *= np.float32(1.0 / 32768.0)
+                        state.last_rms = rms_value(float_pcm)
                         state.last_rms_left = state.last_rms
                         state.last_rms_right = state.last_rms
                         frame_out = frame_in
@@ -809,38 +1034,27 @@ class HudServer:
                 except Exception:
                     self._logger.exception("Failed to process Android mic %s audio frame", state.device_id)
                     continue
+                self._mic_update_seq += 1
 
                 if frame_out is None:
                     continue
 
                 if state.stt_q.full():
-                    try:
-                        _ = state.stt_q.get_nowait()
-                        state.dropped_frames += 1
-                    except asyncio.QueueEmpty:
-                        pass
-                try:
-                    state.stt_q.put_nowait(frame_out)
-                except asyncio.QueueFull:
                     state.dropped_frames += 1
-
-                if state.analysis_q.full():
-                    try:
-                        _ = state.analysis_q.get_nowait()
-                    except asyncio.QueueEmpty:
-                        pass
-                try:
-                    state.analysis_q.put_nowait(frame_out)
-                except asyncio.QueueFull:
-                    pass
+                state.frames.push(frame_out)
         finally:
             self._android_stt.discard(conn)
-            self._android_mic_by_conn.pop(conn, None)
+            mic_state = self._android_mic_by_conn.pop(conn, None)
+            if mic_state is not None and mic_state is self._latest_android_mic:
+                self._latest_android_mic = max(
+                    self._android_mic_by_conn.values(), key=lambda s: s.last_seen_monotonic, default=None
+                )
             self._logger.info("Android /stt disconnected from %s", conn.remote_address)
 
     async def _handle_esp32_audio(self, conn: ServerConnection, query: dict[str, list[str]]) -> None:
         device_id = (query.get("deviceId") or [""])[0] or "unknown"
         role = (query.get("role") or [""])[0] or "unknown"
+        now_fn = asyncio.get_running_loop().time
         self._logger.info("ESP32 connected (query) deviceId=%s role=%s from %s", device_id, role, conn.remote_address)
 
         # Expect a JSON hello first, then binary audio frames.
@@ -851,9 +1065,7 @@ class HudServer:
 
         # Minimal parsing for now (we will validate more later).
         try:
-            import json
-
-            hello_obj: dict[str, Any] = json.loads(hello)
+            hello_obj: dict[str, Any] = loads(hello)
             audio = hello_obj.get("audio") or {}
             audio_format = str(audio.get("format") or "pcm_s16le")
             sample_rate_hz = int(audio.get("sampleRateHz") or 16000)
@@ -899,8 +1111,8 @@ class HudServer:
             bytes_per_frame,
         )
 
-        stt_q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=200)  # ~4s at 20ms frames
-        analysis_q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=200)  # ~4s at 20ms frames
+        # One ring (~4s at 20ms frames) shared by the STT, analysis and RMS consumers.
+        frames = _FrameRing(200)
         prev = self._esp32_by_role.get(hello_role)
         if prev is not None and prev.device_id != hello_device_id:
             self._logger.info(
@@ -909,94 +1121,82 @@ class HudServer:
                 prev.device_id,
                 hello_device_id,
             )
-        self._esp32_by_role[hello_role] = Esp32AudioState(
+        esp32_state = Esp32AudioState(
             device_id=hello_device_id,
             role=hello_role,
             sample_rate_hz=sample_rate_hz,
             channels=channels,
             frame_ms=frame_ms,
             bytes_per_frame=bytes_per_frame,
-            stt_q=stt_q,
-            analysis_q=analysis_q,
+            frames=frames,
+            stt_q=frames.reader(),
+            analysis_q=frames.reader(),
+            rms_q=frames.reader(max_backlog=50),  # ~1s at 20ms frames
             last_rms=0.0,
-            last_seen_monotonic=asyncio.get_running_loop().time(),
+            last_seen_monotonic=now_fn(),
             dropped_frames=0,
         )
+        self._esp32_by_role[hello_role] = esp32_state
+        rms_task = asyncio.create_task(self._esp32_rms_loop(esp32_state), name=f"esp32_rms_{hello_role}")
+
+        # Bound once for the per-frame loop (50 Hz per device).
+        bpf = bytes_per_frame
+        next_size_warn_s = 0.0
+        get_state = self._esp32_by_role.get
 
         try:
             async for msg in conn:
-                if isinstance(msg, str):
-                    # Optional diag messages.
-                    continue
-                if not isinstance(msg, (bytes, bytearray)):
-                    continue
+                # websockets delivers immutable bytes; only copy if we were handed a bytearray.
+                # The same object is shared by the RMS, STT and analysis readers.
+                if type(msg) is not bytes:
+                    if not isinstance(msg, bytearray):
+                        # Optional diag messages (str).
+                        continue
+                    msg = bytes(msg)
 
-                state = self._esp32_by_role.get(hello_role)
+                state = get_state(hello_role)
                 if state is None:
                     continue
 
-                state.last_seen_monotonic = asyncio.get_running_loop().time()
-                state.frames_received += 1
+                now = now_fn()
+                state.last_seen_monotonic = now
+
+                size = len(msg)
+                if size != bpf and bpf and size % bpf == 0:
+                    # Batched message (e.g. udp_to_ws_bridge): k whole frames back to back.
+                    # Split so every reader keeps seeing one frame per entry.
+                    state.frames_received += size // bpf
+                    for off in range(0, size, bpf):
+                        if state.stt_q.full():
+                            state.dropped_frames += 1
+                        state.frames.push(msg[off : off + bpf])
+                    continue
 
-                if len(msg) != state.bytes_per_frame:
+                state.frames_received += 1
+                if size != bpf:
                     # Allow slightly variable frames, but log so firmware can be fixed.
                     state.bad_frame_sizes += 1
-                    # Keep this INFO to reduce log spam when using the UDP bridge / early firmware.
-                    if state.bad_frame_sizes <= 3 or (state.bad_frame_sizes % 50) == 0:
+                    # Keep this INFO but at most once a second per connection: a firmware bug can
+                    # mis-size every frame at 50 Hz, and the stream handler writes synchronously.
+                    if now >= next_size_warn_s:
+                        next_size_warn_s = now + 1.0
                         self._logger.info(
                             "ESP32 %s role=%s unexpected frame size=%d expected=%d badFrameSizes=%d",
-                            state.device_id,
-                            state.role,
-                            len(msg),
-                            state.bytes_per_frame,
+                            hello_device_id,
+                            hello_role,
+                            size,
+                            bpf,
                             state.bad_frame_sizes,
                         )
 
-                # Compute RMS (0..1) for direction/intensity.
-                try:
-                    pcm = np.frombuffer(msg, dtype=np.int16)
-                    if pcm.size:
-                        gain = 1.0
-                        if state.role == "left":
-                            gain = float(self._esp32_gain_left)
-                        elif state.role == "right":
-                            gain = float(self._esp32_gain_right)
-                        gain = max(0.0, gain)
-                        float_pcm = (pcm.astype(np.float32) / np.float32(32768.0)) * np.float32(gain)
-                        float_pcm = np.clip(float_pcm, -1.0, 1.0).astype(np.float32, copy=False)
-                        state.last_rms = float(np.sqrt(np.mean(float_pcm * float_pcm)))
-                        if state.role == "left":
-                            self._radar_buf_fl.append(float_pcm)
-                            self._radar_seen_fl = state.last_seen_monotonic
-                        elif state.role == "right":
-                            self._radar_buf_fr.append(float_pcm)
-                            self._radar_seen_fr = state.last_seen_monotonic
-                except Exception:
-                    self._logger.exception("Failed to compute RMS for ESP32 %s role=%s", state.device_id, state.role)
-
-                # Enqueue audio for downstream processing (STT/classification).
+                # One push feeds RMS (_esp32_rms_loop), STT and classification; each reader
+                # drops its own oldest frames if it falls behind.
                 if state.stt_q.full():
-                    try:
-                        _ = state.stt_q.get_nowait()
-                        state.dropped_frames += 1
-                    except asyncio.QueueEmpty:
-                        pass
-                try:
-                    state.stt_q.put_nowait(bytes(msg))
-                except asyncio.QueueFull:
                     state.dropped_frames += 1
-
-                if state.analysis_q.full():
-                    try:
-                        _ = state.analysis_q.get_nowait()
-                    except asyncio.QueueEmpty:
-                        pass
-                try:
-                    state.analysis_q.put_nowait(bytes(msg))
-                except asyncio.QueueFull:
-                    # Not critical; analysis can drop.
-                    pass
+                state.frames.push(msg)
         finally:
+            rms_task.cancel()
+            await asyncio.gather(rms_task, return_exceptions=True)
             cur = self._esp32_by_role.get(hello_role)
             if cur and cur.device_id == hello_device_id:
                 self._esp32_by_role.pop(hello_role, None)
@@ -1009,27 +1209,86 @@ class HudServer:
                 getattr(cur, "bad_frame_sizes", None),
             )
 
+    async def _esp32_rms_loop(self, state: Esp32AudioState) -> None:
+        """Compute ESP32 RMS (0..1) for direction/intensity off the websocket read loop.
+
+        Frames are drained in small batches so one reduction covers several frames when the
+        loop falls behind; the batch RMS is published as ``last_rms``.
+        """
+        # Reused across batches; the radar ring copies samples in, so nothing keeps a view.
+        scratch = np.empty(8 * max(1, state.bytes_per_frame // 2), dtype=np.float32)
+        while True:
+            frames = _drain_queue(state.rms_q, await state.rms_q.get(), limit=8)
+            try:
+                pcm = np.frombuffer(frames[0] if len(frames) == 1 else b"".join(frames), dtype=np.int16)
+                if pcm.size == 0:
+                    continue
+                gain = 1.0
+                if state.role == "left":
+                    gain = float(self._esp32_gain_left)
+                elif state.role == "right":
+                    gain = float(self._esp32_gain_right)
+                gain = max(0.0, gain)
+                if pcm.size > scratch.size:
+                    scratch = np.empty(pcm.size, dtype=np.float32)
+                # Scale and clip in place in the scratch buffer.
+                float_pcm = scratch[: pcm.size]
+                np.multiply(pcm, np.float32(gain / 32768.0), out=float_pcm)
+                np.clip(float_pcm, -1.0, 1.0, out=float_pcm)
+                state.last_rms = rms_value(float_pcm)
+                self._mic_update_seq += 1
+                if state.role == "left":
+                    self._radar_buf_fl.append(float_pcm)
+                    self._radar_seen_fl = state.last_seen_monotonic
+                elif state.role == "right":
+                    self._radar_buf_fr.append(float_pcm)
+                    self._radar_seen_fr = state.last_seen_monotonic
+            except Exception:
+                self._logger.exception("Failed to compute RMS for ESP32 %s role=%s", state.device_id, state.role)
+
     async def _broadcast_events(self, obj: dict[str, Any]) -> None:
         if not self._android_events:
             return
-        payload = dumps(obj)
+        payload = dumps_utf8(obj)
         await self._broadcast(self._android_events, payload)
 
+    def _publish_events(self, obj: dict[str, Any]) -> None:
+        """Fire-and-forget fan-out for periodic telemetry (status, direction.ui).
+
+        Uses websockets' synchronous ``broadcast``: one encode and no per-client await.
+        ``broadcast`` itself applies no backpressure (it only skips connections that
+        aren't open), so clients whose transport already has more than
+        ``_EVENTS_MAX_WRITE_BUFFER`` bytes queued are left out of this tick instead of
+        buffering telemetry until their ping times out. The payload is a str so it goes
+        out as a text frame.
+        """
+        if not self._android_events:
+            return
+        targets = [c for c in self._android_events if c.transport.get_write_buffer_size() <= _EVENTS_MAX_WRITE_BUFFER]
+        if targets:
+            broadcast(targets, dumps(obj))
+
     async def _broadcast_stt(self, obj: dict[str, Any]) -> None:
         if not self._android_stt:
             return
-        payload = dumps(obj)
+        payload = dumps_utf8(obj)
         await self._broadcast(self._android_stt, payload)
 
-    async def _broadcast(self, conns: set[ServerConnection], payload: str) -> None:
-        dead: list[ServerConnection] = []
-        for c in list(conns):
+    async def _broadcast(self, conns: set[ServerConnection], payload: bytes) -> None:
+        # payload is pre-encoded UTF-8 JSON; text=True keeps it a text frame without
+        # re-encoding it for every client.
+        targets = list(conns)
+        if len(targets) == 1:
             try:
-                await c.send(payload)
+                await targets[0].send(payload, text=True)
             except Exception:
-                dead.append(c)
-        for c in dead:
-            conns.discard(c)
+                conns.discard(targets[0])
+            return
+        # Send concurrently so one slow client doesn't delay the others.
+        results = await asyncio.gather(*(c.send(payload, text=True) for c in targets), return_exceptions=True)
+        for c, result in zip(targets, results):
+            if isinstance(result, BaseException):
+                conns.discard(c)
 
     def _build_status_payload(self, now: float) -> dict[str, Any]:
         esp32 = {
@@ -1050,9 +1309,9 @@ class HudServer:
             for role, s in self._esp32_by_role.items()
         }
         android_mic = None
-        if self._android_mic_by_conn:
-            # Report only the freshest mic sender (hackathon assumption: 1 phone).
-            freshest = max(self._android_mic_by_conn.values(), key=lambda s: s.last_seen_monotonic)
+        # Report only the freshest mic sender (hackathon assumption: 1 phone).
+        freshest = self._latest_android_mic
+        if freshest is not None:
             android_mic = {
                 "deviceId": freshest.device_id,
                 "sampleRateHz": freshest.sample_rate_hz,
@@ -1142,11 +1401,50 @@ class HudServer:
             },
         }
 
+    def _status_key(self) -> tuple[Any, ...]:
+        """State the Android client acts on; the rest of the status payload is diagnostics."""
+        mic = self._latest_android_mic
+        return (
+            tuple((role, s.device_id, s.channels) for role, s in sorted(self._esp32_by_role.items())),
+            (mic.device_id, mic.channels) if mic is not None else None,
+            len(self._android_events),
+            len(self._android_stt),
+            self._stt_audio_source,
+            self._external_haptics_enabled,
+            bool(self._external_haptics_left and self._external_haptics_left.connected),
+            bool(self._external_haptics_right and self._external_haptics_right.connected),
+            self._alarm_detector,
+            self._alarm_fire_active,
+            self._alarm_horn_active,
+            self._alarm_siren_active,
+            self._invert_head_yaw,
+            self._invert_phone_yaw,
+            self._hybrid_front_back_gain,
+            self._hybrid_front_gain,
+            self._hybrid_back_gain,
+            self._quad_front_weight,
+            self._quad_back_weight,
+            self._esp32_gain_left,
+            self._esp32_gain_right,
+            self._cal_head_yaw0,
+            self._cal_torso_yaw0,
+        )
+
     async def _status_loop(self) -> None:
-        while True:
-            await asyncio.sleep(1.0)
-            now = asyncio.get_running_loop().time()
-            await self._broadcast_events(self._build_status_payload(now))
+        # Checked every second, but only sent when client-visible state changed, plus a 10s
+        # heartbeat that carries the diagnostic counters (RMS, queue depths, ages).
+        last_key: tuple[Any, ...] | None = None
+        last_sent_s = 0.0
+        async for now in _fixed_rate_ticker(1.0):
+            if not self._android_events:
+                last_key = None
+                continue
+            key = self._status_key()
+            if key == last_key and (now - last_sent_s) < 10.0:
+                continue
+            last_key = key
+            last_sent_s = now
+            self._publish_events(self._build_status_payload(now))
 
     async def _stt_loop(self) -> None:
         api_key = (os.environ.get("ELEVENLABS_API_KEY") or "").strip()
@@ -1169,6 +1467,22 @@ class HudServer:
 
         last_partial_words: list[str] = []
 
+        async def coalesce(ring: _FrameReader, first: bytes) -> bytes:
+            # Send up to ~100ms (5 x 20ms frames) per STT message: fewer base64/JSON/TLS writes
+            # for the same continuous PCM stream.
+            chunks = _drain_queue(ring, first, limit=5)
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + 0.1
+            while len(chunks) < 5:
+                remaining = deadline - loop.time()
+                if remaining <= 0.0:
+                    break
+                frame = await ring.get_within(remaining)
+                if frame is None:
+                    break
+                chunks.append(frame)
+            return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
         async def audio_frames() -> Any:
             active_role = "left"
             while True:
@@ -1190,16 +1504,12 @@ class HudServer:
                     fallback = self._esp32_by_role.get("right" if active_role == "left" else "left")
                     state = preferred or fallback
                     if state is not None:
-                        try:
-                            frame = await asyncio.wait_for(state.stt_q.get(), timeout=0.25)
-                        except asyncio.CancelledError:
-                            raise
-                        except asyncio.TimeoutError:
-                            # If user explicitly selected ESP32, don't fall back automatically.
-                            if source == "esp32":
-                                continue
-                        else:
-                            yield frame
+                        frame = await state.stt_q.get_within(0.25)
+                        if frame is not None:
+                            yield await coalesce(state.stt_q, frame)
+                            continue
+                        # If user explicitly selected ESP32, don't fall back automatically.
+                        if source == "esp32":
                             continue
                     elif source == "esp32":
                         await asyncio.sleep(0.05)
@@ -1207,18 +1517,14 @@ class HudServer:
 
                 # 2) Android mic fallback (auto + android-only)
                 if source in ("auto", "android_mic"):
-                    if self._android_mic_by_conn:
-                        mic = max(self._android_mic_by_conn.values(), key=lambda s: s.last_seen_monotonic)
-                        try:
-                            frame = await asyncio.wait_for(mic.stt_q.get(), timeout=0.25)
-                        except asyncio.CancelledError:
-                            raise
-                        except asyncio.TimeoutError:
-                            # If user explicitly selected Android mic, don't fall back automatically.
-                            if source == "android_mic":
-                                continue
-                        else:
-                            yield frame
+                    mic = self._latest_android_mic
+                    if mic is not None:
+                        frame = await mic.stt_q.get_within(0.25)
+                        if frame is not None:
+                            yield await coalesce(mic.stt_q, frame)
+                            continue
+                        # If user explicitly selected Android mic, don't fall back automatically.
+                        if source == "android_mic":
                             continue
                     elif source == "android_mic":
                         await asyncio.sleep(0.05)
@@ -1261,13 +1567,26 @@ class HudServer:
 
     async def _direction_loop(self) -> None:
         """Continuously derive direction/intensity and send UI placement to Android."""
-        while True:
-            await asyncio.sleep(0.05)  # 20Hz
-            now = asyncio.get_running_loop().time()
+        last_seq = -1
+        last_compute_s = 0.0
+        async for now in _fixed_rate_ticker(0.05):  # 20Hz
+            # Nothing new since the last tick: only recompute on a 2Hz heartbeat, which also
+            # picks up mics going stale and config changes.
+            if self._mic_update_seq == last_seq and (now - last_compute_s) < 0.5:
+                continue
+            last_seq = self._mic_update_seq
+            last_compute_s = now
 
             self._log_esp32_audio_levels(now=now)
 
-            if (now - self._radar_last_compute_s) >= 0.2:
+            # Radar dots are UI-only: skip the per-channel FFTs while no /events client is listening.
+            if not self._android_events:
+                # The baseline stops adapting while skipped; drop it (and the tracks) so the next
+                # client starts from a fresh baseline instead of outliers against stale audio.
+                if self._radar_last_baseline is not None or self._radar_tracks:
+                    self._radar_last_baseline = None
+                    self._radar_tracks.clear()
+            elif (now - self._radar_last_compute_s) >= 0.2:
                 self._radar_last_compute_s = now
                 self._update_radar_tracks(now)
 
@@ -1288,11 +1607,9 @@ class HudServer:
             fr = max(0.0, front_right.last_rms) if has_front and front_right else 0.0
 
             # Android phone: back-left / back-right (requires stereo to be meaningful).
-            mic = None
-            if self._android_mic_by_conn:
-                mic = max(self._android_mic_by_conn.values(), key=lambda s: s.last_seen_monotonic)
-                if (now - mic.last_seen_monotonic) >= 1.0:
-                    mic = None
+            mic = self._latest_android_mic
+            if mic is not None and (now - mic.last_seen_monotonic) >= 1.0:
+                mic = None
             has_back = mic is not None and mic.channels == 2
             bl = max(0.0, mic.last_rms_left) if has_back and mic else 0.0
             br = max(0.0, mic.last_rms_right) if has_back and mic else 0.0
@@ -1301,44 +1618,21 @@ class HudServer:
             radar_dots = self._emit_radar_tracks(now, delta_yaw)
 
             if has_front and has_back:
-                # Hybrid direction:
-                # - left/right is decided purely by the phone's stereo mic (back L/R)
-                # - front/back is decided purely by front-vs-back intensity (sum of front vs sum of back)
-                eps = 1e-6
-                back_total = float(bl + br)
-                front_total = float(fl + fr)
-                x_balance = float((br - bl) / (back_total + eps))  # -1..+1 (phone decides L/R)
-                front_gain = max(0.0, float(self._hybrid_front_gain))
-                back_gain = max(0.0, float(self._hybrid_back_gain))
-                front_scaled = front_total * front_gain
-                back_scaled = back_total * back_gain
-                y_balance = float((front_scaled - back_scaled) / (front_scaled + back_scaled + eps))  # -1..+1 (front/back)
-                x_balance = float(np.clip(x_balance, -1.0, 1.0))
-                y_balance = float(y_balance * float(self._hybrid_front_back_gain))
-                y_balance = float(np.clip(y_balance, -1.0, 1.0))
-                raw_direction_deg = float(np.degrees(np.arctan2(x_balance, y_balance)))
+                # Hybrid direction: phone decides L/R, front-vs-back intensity decides F/B.
+                raw_direction_deg, y_balance = self._hybrid_direction(fl, fr, bl, br, eps=1e-6)
                 total = fl + fr + bl + br
                 total = max(0.0, float(total) - self._direction_noise_floor)
-                intensity = float(np.clip(total * self._direction_gain_quad, 0.0, 1.0))
+                intensity = _clamp(float(total * self._direction_gain_quad), 0.0, 1.0)
                 source = "quad"
             elif has_front:
-                total = fl + fr + 1e-6
-                balance = (fr - fl) / total  # -1..+1
-                raw_direction_deg = float(np.clip(balance * 90.0, -90.0, 90.0))
-                total = max(0.0, float(total) - self._direction_noise_floor)
-                intensity = float(np.clip(total * self._direction_gain_lr, 0.0, 1.0))
+                raw_direction_deg = self._front_direction(fl, fr, eps=1e-6)
+                total = max(0.0, float(fl + fr + 1e-6) - self._direction_noise_floor)
+                intensity = _clamp(float(total * self._direction_gain_lr), 0.0, 1.0)
                 source = "front"
             elif has_back:
-                total = bl + br + 1e-6
-                balance = (br - bl) / total  # -1..+1
-                # Phone worn behind the neck: treat this as a "back" array.
-                # Map balance into a rear arc around 180deg. Increase sensitivity so
-                # small L/R differences show up as more lateral directions.
-                gain = float(np.clip(self._back_balance_gain_deg, 0.0, 170.0))
-                shaped = self._shape_balance(float(balance))
-                raw_direction_deg = self._wrap_deg(180.0 - (shaped * gain))
-                total = max(0.0, float(total) - self._direction_noise_floor)
-                intensity = float(np.clip(total * self._direction_gain_lr, 0.0, 1.0))
+                raw_direction_deg = self._back_direction(bl, br, eps=1e-6)
+                total = max(0.0, float(bl + br + 1e-6) - self._direction_noise_floor)
+                intensity = _clamp(float(total * self._direction_gain_lr), 0.0, 1.0)
                 source = "back"
             else:
                 # Last resort: use whichever single mic is available (no direction, intensity only).
@@ -1363,7 +1657,7 @@ class HudServer:
 
                 one_rms = float(getattr(one, "last_rms", 0.0))
                 one_rms = max(0.0, one_rms - self._direction_noise_floor)
-                intensity = float(np.clip(one_rms * self._direction_gain_mono, 0.0, 1.0))
+                intensity = _clamp(float(one_rms * self._direction_gain_mono), 0.0, 1.0)
 
             if raw_direction_deg is None or intensity is None or source is None:
                 continue
@@ -1403,7 +1697,53 @@ class HudServer:
                 br=br,
                 ui=ui,
             )
-            await self._broadcast_events({"type": "direction.ui", **payload})
+
+            # Only push direction.ui when the quantized state changes (2deg / 0.02 intensity bins),
+            # with a 2Hz keepalive so clients still see a live stream when nothing moves.
+            # Below the silence threshold direction is just noise: treat every such tick as the
+            # same state and drop the keepalive to 1Hz.
+            silent = intensity < 0.03
+            broadcast_key = (
+                source,
+                None if silent else round(direction_deg / 2.0),
+                0 if silent else round(intensity / 0.02),
+                tuple((d["trackId"], round(d["directionDeg"] / 2.0), round(d["intensity"] / 0.02)) for d in radar_dots),
+            )
+            keepalive_s = 1.0 if silent else 0.5
+            if broadcast_key == self._direction_broadcast_key and (now - self._direction_broadcast_last_s) < keepalive_s:
+                continue
+            self._direction_broadcast_key = broadcast_key
+            self._direction_broadcast_last_s = now
+            self._publish_events({"type": "direction.ui", **payload})
+
+    def _hybrid_direction(self, fl: float, fr: float, bl: float, br: float, *, eps: float) -> tuple[float, float]:
+        """Front+back direction estimate; returns (raw_direction_deg, y_balance).
+
+        - left/right is decided purely by the phone's stereo mic (back L/R)
+        - front/back is decided purely by front-vs-back intensity (sum of front vs sum of back)
+        """
+        back_total = float(bl + br)
+        front_total = float(fl + fr)
+        x_balance = float((br - bl) / (back_total + eps))  # -1..+1 (phone decides L/R)
+        front_scaled = front_total * max(0.0, float(self._hybrid_front_gain))
+        back_scaled = back_total * max(0.0, float(self._hybrid_back_gain))
+        y_balance = float((front_scaled - back_scaled) / (front_scaled + back_scaled + eps))  # -1..+1 (front/back)
+        x_balance = _clamp(x_balance, -1.0, 1.0)
+        y_balance = _clamp(y_balance * float(self._hybrid_front_back_gain), -1.0, 1.0)
+        return math.degrees(math.atan2(x_balance, y_balance)), y_balance
+
+    def _front_direction(self, fl: float, fr: float, *, eps: float) -> float:
+        balance = (fr - fl) / (fl + fr + eps)  # -1..+1
+        return _clamp(float(balance * 90.0), -90.0, 90.0)
+
+    def _back_direction(self, bl: float, br: float, *, eps: float) -> float:
+        balance = (br - bl) / (bl + br + eps)  # -1..+1
+        # Phone worn behind the neck: treat this as a "back" array.
+        # Map balance into a rear arc around 180deg. Increase sensitivity so
+        # small L/R differences show up as more lateral directions.
+        gain = _clamp(float(self._back_balance_gain_deg), 0.0, 170.0)
+        shaped = self._shape_balance(float(balance))
+        return self._wrap_deg(180.0 - (shaped * gain))
 
     def _update_radar_tracks(self, now: float) -> None:
         # Compute a few frequency-peaks and estimate a direction per peak, then
@@ -1439,7 +1779,7 @@ class HudServer:
         if br is not None:
             br = br[-n:]
 
-        window = np.hanning(n).astype(np.float32)
+        window, freqs, idx = _radar_fft_setup(n, sample_rate_hz, self._radar_min_freq_hz, self._radar_max_freq_hz)
 
         def power(x: np.ndarray) -> np.ndarray:
             x = x.astype(np.float32, copy=False)
@@ -1460,9 +1800,6 @@ class HudServer:
             if p is not None:
                 total += p
 
-        freqs = np.fft.rfftfreq(n, d=1.0 / sample_rate_hz)
-        mask = (freqs >= self._radar_min_freq_hz) & (freqs <= self._radar_max_freq_hz)
-        idx = np.where(mask)[0]
         if idx.size == 0:
             return
 
@@ -1476,7 +1813,7 @@ class HudServer:
             baseline = total.astype(np.float32, copy=True)
             self._radar_last_baseline = baseline
         else:
-            a = float(np.clip(self._radar_baseline_alpha, 0.0, 1.0))
+            a = _clamp(float(self._radar_baseline_alpha), 0.0, 1.0)
             cap = max(1.0, float(self._radar_baseline_peak_cap))
             # Avoid letting short spikes immediately become "normal".
             clipped = np.minimum(total, baseline * cap)
@@ -1537,41 +1874,22 @@ class HudServer:
                 continue
 
             # Source strength is based on how much a frequency band exceeds the baseline.
-            intensity = float(np.clip(np.sqrt(band_excess / max_ex), 0.0, 1.0))
+            intensity = _clamp(math.sqrt(band_excess / max_ex), 0.0, 1.0)
 
             # Subtract baseline proportionally so direction is driven by the outlier component.
-            scale = float(np.clip(band_excess / (band_total + eps), 0.0, 1.0))
+            scale = _clamp(band_excess / (band_total + eps), 0.0, 1.0)
             e_fl *= scale
             e_fr *= scale
             e_bl *= scale
             e_br *= scale
 
+            # Match the same direction behavior as the main direction loop.
             if has_front and has_back:
-                # Match the same hybrid direction behavior as the main direction loop.
-                eps = 1e-9
-                back_total = float(e_bl + e_br)
-                front_total = float(e_fl + e_fr)
-                x_balance = float((e_br - e_bl) / (back_total + eps))
-                front_gain = max(0.0, float(self._hybrid_front_gain))
-                back_gain = max(0.0, float(self._hybrid_back_gain))
-                front_scaled = front_total * front_gain
-                back_scaled = back_total * back_gain
-                y_balance = float((front_scaled - back_scaled) / (front_scaled + back_scaled + eps))
-                x_balance = float(np.clip(x_balance, -1.0, 1.0))
-                y_balance = float(y_balance * float(self._hybrid_front_back_gain))
-                y_balance = float(np.clip(y_balance, -1.0, 1.0))
-                raw_dir = float(np.degrees(np.arctan2(x_balance, y_balance)))
+                raw_dir, _ = self._hybrid_direction(e_fl, e_fr, e_bl, e_br, eps=1e-9)
             elif has_front:
-                t = (e_fl + e_fr) + 1e-9
-                balance = (e_fr - e_fl) / t
-                raw_dir = float(np.clip(balance * 90.0, -90.0, 90.0))
+                raw_dir = self._front_direction(e_fl, e_fr, eps=1e-9)
             else:
-                # Back-only.
-                t = (e_bl + e_br) + 1e-9
-                balance = (e_br - e_bl) / t
-                gain = float(np.clip(self._back_balance_gain_deg, 0.0, 170.0))
-                shaped = self._shape_balance(float(balance))
-                raw_dir = self._wrap_deg(180.0 - (shaped * gain))
+                raw_dir = self._back_direction(e_bl, e_br, eps=1e-9)
 
             # Use an excess-weighted centroid for more stable color/labeling.
             lo = max(0, int(b) - band_bins)
@@ -1640,7 +1958,7 @@ class HudServer:
             if age > 3.0:
                 self._radar_tracks.pop(tid, None)
                 continue
-            decay = float(np.exp(-age / tau))
+            decay = math.exp(-age / tau)
             display_i = float(tr.intensity) * decay
             if display_i < min_i:
                 self._radar_tracks.pop(tid, None)
@@ -1668,8 +1986,10 @@ class HudServer:
         sample_rate_hz = 16000
         window_samples = sample_rate_hz  # 1s
         hop_s = 0.2
-
-        buf = np.zeros((0,), dtype=np.float32)
+        # (fire, horn) bands; energies are accumulated per frame as audio arrives.
+        window = BandEnergyWindow(sample_rate_hz, window_samples, ((2500.0, 3500.0), (300.0, 900.0)))
+        # Decode scratch; each frame is consumed before the next one is decoded.
+        pcm_scratch = np.empty((4096,), dtype=np.float32)
 
         fire_last_positive = 0.0
         fire_active = False
@@ -1687,11 +2007,9 @@ class HudServer:
             # Choose an analysis source (stickiness + fallback to avoid blocking).
             left = self._esp32_by_role.get("left")
             right = self._esp32_by_role.get("right")
-            android_mic = None
-            if self._android_mic_by_conn:
-                android_mic = max(self._android_mic_by_conn.values(), key=lambda s: s.last_seen_monotonic)
-                if (loop.time() - android_mic.last_seen_monotonic) > 1.0:
-                    android_mic = None
+            android_mic = self._latest_android_mic
+            if android_mic is not None and (loop.time() - android_mic.last_seen_monotonic) > 1.0:
+                android_mic = None
 
             if not left and not right and android_mic is None:
                 await asyncio.sleep(0.05)
@@ -1705,42 +2023,35 @@ class HudServer:
             preferred = self._esp32_by_role.get(active_role)
             fallback = self._esp32_by_role.get("right" if active_role == "left" else "left")
 
-            frame_bytes: bytes | None = None
+            frames: list[bytes] = []
             for state in (preferred, fallback):
                 if state is None:
                     continue
-                try:
-                    frame_bytes = await asyncio.wait_for(state.analysis_q.get(), timeout=0.25)
+                first = await state.analysis_q.get_within(0.25)
+                if first is not None:
+                    frames = _drain_queue(state.analysis_q, first)
                     break
-                except asyncio.TimeoutError:
-                    continue
-            if frame_bytes is None and android_mic is not None:
-                try:
-                    frame_bytes = await asyncio.wait_for(android_mic.analysis_q.get(), timeout=0.25)
-                except asyncio.TimeoutError:
-                    frame_bytes = None
+            if not frames and android_mic is not None:
+                first = await android_mic.analysis_q.get_within(0.25)
+                if first is not None:
+                    frames = _drain_queue(android_mic.analysis_q, first)
 
-            if frame_bytes is None:
+            if not frames:
                 await asyncio.sleep(0.01)
                 continue
-            frame = pcm16le_bytes_to_float32(frame_bytes)
-            if frame.size == 0:
-                continue
-            buf = np.concatenate([buf, frame])
-            if buf.size > window_samples:
-                buf = buf[-window_samples:]
+            for frame_bytes in frames:
+                window.push(pcm16le_bytes_to_float32(frame_bytes, out=pcm_scratch))
 
             now = loop.time()
             if now < next_eval:
                 continue
             next_eval = now + hop_s
-            if buf.size < window_samples:
+            if not window.filled:
                 continue
 
-            total_rms = rms_value(buf)
             # Band ratios (coarse heuristics; tune in the field).
-            fire_ratio = band_power_ratio(buf, sample_rate_hz, (2500.0, 3500.0))
-            horn_ratio = band_power_ratio(buf, sample_rate_hz, (300.0, 900.0))
+            total_rms = window.rms()
+            fire_ratio, horn_ratio = window.band_ratios()
 
             fire_detected = total_rms > self._alarm_rms_threshold and fire_ratio > self._fire_ratio_threshold
             horn_detected = total_rms > self._alarm_rms_threshold and horn_ratio > self._horn_ratio_threshold
@@ -1750,7 +2061,7 @@ class HudServer:
                     return 0.0
                 rms_score = (total - total_th) / max(total_th, 1e-6)
                 ratio_score = (ratio - ratio_th) / max(ratio_th, 1e-6)
-                return float(np.clip(0.5 * rms_score + 0.5 * ratio_score, 0.0, 1.0))
+                return _clamp(0.5 * rms_score + 0.5 * ratio_score, 0.0, 1.0)
 
             fire_confidence = confidence(total_rms, fire_ratio, self._alarm_rms_threshold, self._fire_ratio_threshold)
             horn_confidence = confidence(total_rms, horn_ratio, self._alarm_rms_threshold, self._horn_ratio_threshold)
@@ -1815,8 +2126,8 @@ class HudServer:
     async def _yamnet_alarms_loop(self) -> None:
         """Realtime YAMNet-based horn/fire detection from the live audio stream."""
         sample_rate_hz = 16000
-        window_s = float(np.clip(self._yamnet_window_s, 0.25, 4.0))
-        hop_s = float(np.clip(self._yamnet_hop_s, 0.05, 1.0))
+        window_s = _clamp(float(self._yamnet_window_s), 0.25, 4.0)
+        hop_s = _clamp(float(self._yamnet_hop_s), 0.05, 1.0)
         min_rms = float(max(0.0, self._yamnet_min_rms))
         window_samples = int(sample_rate_hz * window_s)
 
@@ -1828,8 +2139,9 @@ class HudServer:
                 class_map_path=self._yamnet_class_map_path,
                 sample_rate_hz=sample_rate_hz,
                 topk=int(self._yamnet_topk),
+                jit_compile=self._yamnet_xla,
             )
-            detector.load()
+            await asyncio.get_running_loop().run_in_executor(self._analysis_executor, detector.load)
         except Exception:
             self._logger.exception(
                 "YAMNet alarms: failed to load (model=%s classMap=%s).",
@@ -1852,7 +2164,9 @@ class HudServer:
             self._yamnet_siren_threshold,
         )
 
-        buf = np.zeros((0,), dtype=np.float32)
+        ring = _SampleRing(window_samples, track_energy=True)
+        # Decode scratch; each frame is copied into the ring before the next decode.
+        pcm_scratch = np.empty((4096,), dtype=np.float32)
         loop = asyncio.get_running_loop()
         next_eval = loop.time()
 
@@ -1873,11 +2187,9 @@ class HudServer:
             # Choose an analysis source (stickiness + fallback to avoid blocking).
             left = self._esp32_by_role.get("left")
             right = self._esp32_by_role.get("right")
-            android_mic = None
-            if self._android_mic_by_conn:
-                android_mic = max(self._android_mic_by_conn.values(), key=lambda s: s.last_seen_monotonic)
-                if (loop.time() - android_mic.last_seen_monotonic) > 1.0:
-                    android_mic = None
+            android_mic = self._latest_android_mic
+            if android_mic is not None and (loop.time() - android_mic.last_seen_monotonic) > 1.0:
+                android_mic = None
 
             if not left and not right and android_mic is None:
                 await asyncio.sleep(0.05)
@@ -1891,48 +2203,44 @@ class HudServer:
             preferred = self._esp32_by_role.get(active_role)
             fallback = self._esp32_by_role.get("right" if active_role == "left" else "left")
 
-            frame_bytes: bytes | None = None
+            frames: list[bytes] = []
             for state in (preferred, fallback):
                 if state is None:
                     continue
-                try:
-                    frame_bytes = await asyncio.wait_for(state.analysis_q.get(), timeout=0.25)
+                first = await state.analysis_q.get_within(0.25)
+                if first is not None:
+                    frames = _drain_queue(state.analysis_q, first)
                     break
-                except asyncio.TimeoutError:
-                    continue
-            if frame_bytes is None and android_mic is not None:
-                try:
-                    frame_bytes = await asyncio.wait_for(android_mic.analysis_q.get(), timeout=0.25)
-                except asyncio.TimeoutError:
-                    frame_bytes = None
+            if not frames and android_mic is not None:
+                first = await android_mic.analysis_q.get_within(0.25)
+                if first is not None:
+                    frames = _drain_queue(android_mic.analysis_q, first)
 
-            if frame_bytes is None:
+            if not frames:
                 await asyncio.sleep(0.01)
                 continue
 
-            frame = pcm16le_bytes_to_float32(frame_bytes)
-            if frame.size == 0:
-                continue
-            buf = np.concatenate([buf, frame])
-            if buf.size > window_samples:
-                buf = buf[-window_samples:]
+            for frame_bytes in frames:
+                ring.append(pcm16le_bytes_to_float32(frame_bytes, out=pcm_scratch))
 
             now = loop.time()
             if now < next_eval:
                 continue
             next_eval = now + hop_s
-            if buf.size < window_samples:
+            if len(ring) < window_samples:
                 continue
 
-            window = buf[-window_samples:].copy()
-            total_rms = rms_value(window)
+            total_rms = ring.rms()
             if total_rms < min_rms:
                 self._yamnet_last_fire_score = 0.0
                 self._yamnet_last_horn_score = 0.0
                 self._yamnet_last_siren_score = 0.0
                 self._yamnet_last_top = []
             else:
-                scores = await asyncio.to_thread(detector.classify_window, window)
+                window = ring.get()
+                # Awaited inline, so at most one inference is in flight; frames keep queuing
+                # (drop-oldest) in analysis_q meanwhile.
+                scores = await loop.run_in_executor(self._analysis_executor, detector.classify_window, window)
                 self._yamnet_last_fire_score = float(scores.fire_alarm)
                 self._yamnet_last_horn_score = float(scores.car_horn)
                 self._yamnet_last_siren_score = float(scores.siren)
@@ -2032,29 +2340,25 @@ class HudServer:
 
     def _direction_to_ui(self, direction_deg: float, intensity: float) -> dict[str, Any]:
         # Map direction to radar coordinates (normalized -1..1) and edge glow.
-        theta = np.deg2rad(direction_deg)
-        radius = float(np.clip(intensity, 0.0, 1.0))
-        radar_x = float(np.sin(theta) * radius)
-        radar_y = float(np.cos(theta) * radius)
-
-        if -45.0 <= direction_deg <= 45.0:
-            glow_edge = "top"
-        elif 45.0 < direction_deg < 135.0:
-            glow_edge = "right"
-        elif -135.0 < direction_deg < -45.0:
-            glow_edge = "left"
-        else:
-            glow_edge = "bottom"
+        theta = math.radians(direction_deg)
+        radius = _clamp(float(intensity), 0.0, 1.0)
+        radar_x = math.sin(theta) * radius
+        radar_y = math.cos(theta) * radius
+
+        # 90deg quadrants centred on 0 (top), 90 (right), 180 (bottom), -90 (left).
+        glow_edge = _GLOW_EDGES[int((direction_deg + 45.0) // 90.0) % 4]
 
         return {
             "radarX": radar_x,
             "radarY": radar_y,
             "glowEdge": glow_edge,
-            "glowStrength": float(np.clip(intensity, 0.0, 1.0)),
+            "glowStrength": _clamp(float(intensity), 0.0, 1.0),
         }
 
-    def _current_direction_payload(self) -> dict[str, Any]:
-        return dict(self._latest_direction_payload)
+    def _current_direction_payload(self) -> Mapping[str, Any]:
+        # _direction_loop replaces the payload dict wholesale each tick and never mutates it,
+        # so hand out a read-only view instead of copying; callers splat it into a new dict.
+        return MappingProxyType(self._latest_direction_payload)
 
     def _log_direction_debug(
         self,
@@ -2070,6 +2374,8 @@ class HudServer:
         br: float,
         ui: dict[str, Any],
     ) -> None:
+        if not self._logger.isEnabledFor(logging.DEBUG):
+            return
         # Avoid spamming logs; direction loop runs at 20Hz.
         if (now - self._direction_log_last_s) < 1.0:
             return
@@ -2105,7 +2411,7 @@ class HudServer:
         self._esp32_level_log_last_s = now
 
         def dbfs(rms: float) -> float:
-            return float(20.0 * np.log10(max(1e-8, float(rms))))
+            return 20.0 * math.log10(max(1e-8, float(rms)))
 
         l_id = left.device_id if left_fresh and left else "offline"
         r_id = right.device_id if right_fresh and right else "offline"
@@ -2142,28 +2448,43 @@ class HudServer:
 
         balance is expected in [-1, 1]. Returns a value in [-1, 1].
         """
-        b = float(np.clip(balance, -1.0, 1.0))
-        exp = float(np.clip(self._back_balance_exp, 0.1, 1.0))
-        return float(np.sign(b) * (abs(b) ** exp))
+        b = _clamp(float(balance), -1.0, 1.0)
+        exp = _clamp(float(self._back_balance_exp), 0.1, 1.0)
+        if b == 0.0:
+            return 0.0
+        return math.copysign(abs(b) ** exp, b)
 
     def _ema(self, prev: float, obs: float, alpha: float) -> float:
-        a = float(np.clip(alpha, 0.0, 1.0))
+        a = _clamp(float(alpha), 0.0, 1.0)
         return (1.0 - a) * float(prev) + a * float(obs)
 
+    def _set_keywords(self, keywords: list[str]) -> None:
+        """Replace the keyword list (already normalized) and rebuild the matcher."""
+        self._keywords = list(dict.fromkeys(keywords))
+        self._keyword_automaton = None
+        if ahocorasick is None or not self._keywords:
+            return
+        automaton = ahocorasick.Automaton()
+        for kw in self._keywords:
+            automaton.add_word(kw, kw)
+        automaton.make_automaton()
+        self._keyword_automaton = automaton
+
     async def _check_keywords(self, text: str) -> None:
         if not self._keywords:
             return
-        normalized = " ".join(str(text).lower().split())
+        normalized = _WHITESPACE_RE.sub(" ", str(text).lower()).strip()
         if not normalized:
             return
+        if self._keyword_automaton is not None:
+            hits = {kw for _, kw in self._keyword_automaton.iter(normalized)}
+            if not hits:
+                return
+            matched = [kw for kw in self._keywords if kw in hits]
+        else:
+            matched = [kw for kw in self._keywords if kw in normalized]
         now = asyncio.get_running_loop().time()
-        for kw in self._keywords:
-            # Case-insensitive match. Don't assume keywords were pre-normalized.
-            kw_norm = " ".join(str(kw).lower().split())
-            if not kw_norm:
-                continue
-            if kw_norm not in normalized:
-                continue
+        for kw_norm in matched:
             last = self._keyword_last_hit.get(kw_norm, 0.0)
             if (now - last) < self._keyword_cooldown_s:
                 continue
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import csv
 import os
 from dataclasses import dataclass
 
@@ -30,24 +31,13 @@ def default_class_map_path() -> str:
 
 def load_yamnet_class_names(class_map_csv_path: str) -> list[str]:
     # CSV columns: index,mid,display_name
-    # Keep parsing dependency-free (no pandas).
-    names: list[str] = []
-    with open(class_map_csv_path, "r", encoding="utf-8") as f:
-        header = f.readline()
+    # Keep parsing dependency-free (no pandas); the csv module handles quoted names with commas.
+    with open(class_map_csv_path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
         if "display_name" not in header:
             raise ValueError("Invalid YAMNet class map header")
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            # Split first 2 commas; display_name may be quoted and contain commas.
-            parts = line.split(",", 2)
-            if len(parts) != 3:
-                continue
-            display = parts[2].strip()
-            if display.startswith('"') and display.endswith('"'):
-                display = display[1:-1]
-            names.append(display)
+        names = [row[2].strip() for row in reader if len(row) >= 3]
     # YAMNet uses 521 classes.
     if len(names) < 100:
         raise ValueError(f"YAMNet class map seems too small ({len(names)} classes)")
@@ -75,6 +65,8 @@ class YamnetDetector:
         # - 319: "Fire engine, fire truck (siren)"
         siren_class_idxs: tuple[int, ...] = (390, 316, 317, 318, 319),
         topk: int = 5,
+        # XLA-compile the forward pass (fuses conv/BN/ReLU blocks; slower first call).
+        jit_compile: bool = False,
     ) -> None:
         self._model_path = model_path or default_model_path()
         self._class_map_path = class_map_path or default_class_map_path()
@@ -83,10 +75,17 @@ class YamnetDetector:
         self._horn_idxs = tuple(int(i) for i in car_horn_class_idxs)
         self._siren_idxs = tuple(int(i) for i in siren_class_idxs)
         self._topk = max(0, int(topk))
+        self._jit_compile = bool(jit_compile)
 
         self._tf = None
         self._model = None
+        self._infer = None
         self._class_names = load_yamnet_class_names(self._class_map_path)
+        # Valid class indices per alarm as intp arrays, resolved once for the model's class count.
+        self._alarm_idx_classes = -1
+        self._alarm_idx_arrays: tuple[np.ndarray, ...] = ()
+        # Per-class max across frames; reused by every classification (results copy out of it).
+        self._mx_buf: np.ndarray | None = None
 
     @property
     def model_path(self) -> str:
@@ -100,6 +99,10 @@ class YamnetDetector:
         # Lazy import so the server can still run without TF installed (it will just disable YAMNet alarms).
         import tensorflow as tf  # type: ignore
 
+        if self._model_path.lower().endswith(".tflite"):
+            self._load_tflite(tf)
+            return
+
         try:
             import tf_keras  # type: ignore  # noqa: F401
         except Exception as e:  # pragma: no cover
@@ -112,26 +115,59 @@ class YamnetDetector:
         self._tf = tf
         self._model = yamnet_model()
         self._model.load_weights(self._model_path)
+        # A traced graph with a fixed (batch, samples) signature: calling the Keras model
+        # eagerly re-dispatches every layer op from Python on each window.
+        model = self._model
+        self._infer = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec(shape=[None, None], dtype=tf.float32)],
+            jit_compile=self._jit_compile,
+        )
         # Warm up once to avoid first-hit latency spikes.
         warm = np.zeros((self._sample_rate_hz,), dtype=np.float32)
         _ = self._predict_scores(warm)
 
+    def _load_tflite(self, tf) -> None:  # noqa: ANN001
+        """Load a converted model (see tools/yamnet_tflite_export.py) into the TFLite interpreter.
+
+        The interpreter runs on the XNNPACK CPU delegate by default; input/output stay float32.
+        """
+        interpreter = tf.lite.Interpreter(model_path=self._model_path, num_threads=os.cpu_count() or 1)
+        interpreter.allocate_tensors()
+        inp = interpreter.get_input_details()[0]
+        out_index = interpreter.get_output_details()[0]["index"]
+        shape = [tuple(int(d) for d in inp["shape"])]
+
+        def infer(x: np.ndarray) -> np.ndarray:
+            x = np.ascontiguousarray(x, dtype=np.float32)
+            if x.shape != shape[0]:
+                interpreter.resize_tensor_input(inp["index"], list(x.shape))
+                interpreter.allocate_tensors()
+                shape[0] = x.shape
+            interpreter.set_tensor(inp["index"], x)
+            interpreter.invoke()
+            return interpreter.get_tensor(out_index)
+
+        self._tf = tf
+        self._infer = infer
+        # Warm up at the exported window length.
+        _ = self._predict_scores(np.zeros((shape[0][-1],), dtype=np.float32))
+
     def _ensure_loaded(self) -> None:
-        if self._model is None:
+        if self._infer is None:
             raise RuntimeError("YAMNet model not loaded")
 
     def _predict_scores(self, waveform_16k: np.ndarray) -> np.ndarray:
         self._ensure_loaded()
-        tf = self._tf
-        model = self._model
-        if tf is None or model is None:
+        infer = self._infer
+        if self._tf is None or infer is None:
             raise RuntimeError("YAMNet model not loaded")
 
         x = np.asarray(waveform_16k, dtype=np.float32)
         if x.ndim != 1:
             x = x.reshape((-1,))
 
-        out = model(np.expand_dims(x, 0), training=False)
+        out = infer(np.expand_dims(x, 0))
 
         # Keras returns tensors; some exports return a tuple/list.
         if isinstance(out, (tuple, list)):
@@ -149,29 +185,66 @@ class YamnetDetector:
             raise RuntimeError(f"Unexpected YAMNet output shape: {scores.shape}")
         return scores.astype(np.float32, copy=False)
 
+    def _predict_scores_batch(self, waveforms_16k: np.ndarray) -> np.ndarray:
+        """Run one model call on a (batch, samples) array; returns (batch, frames, classes)."""
+        self._ensure_loaded()
+        infer = self._infer
+        if infer is None:
+            raise RuntimeError("YAMNet model not loaded")
+
+        x = np.asarray(waveforms_16k, dtype=np.float32)
+        if x.ndim != 2:
+            raise ValueError(f"Expected (batch, samples) waveforms, got shape {x.shape}")
+
+        out = infer(x)
+        out0 = out[0] if isinstance(out, (tuple, list)) else out
+        # The graph flattens patches across the batch: (batch*frames, classes).
+        scores = np.array(out0).astype(np.float32, copy=False)
+        return scores.reshape((x.shape[0], -1, scores.shape[-1]))
+
     def classify_window(self, waveform_16k: np.ndarray) -> YamnetScores:
-        scores = self._predict_scores(waveform_16k)
+        return self._summarize(self._predict_scores(waveform_16k))
+
+    def classify_batch(self, waveforms_16k: list[np.ndarray]) -> list[YamnetScores]:
+        """Classify several equal-length windows with a single model call.
+
+        Amortizes the per-call TF dispatch overhead for offline scans of a long
+        recording (``tools/yamnet_test.py --window-s``). Windows of differing length
+        fall back to one call each.
+        """
+        if not waveforms_16k:
+            return []
+        if len({int(np.size(w)) for w in waveforms_16k}) != 1:
+            return [self.classify_window(w) for w in waveforms_16k]
+        batch = np.stack([np.asarray(w, dtype=np.float32).reshape((-1,)) for w in waveforms_16k])
+        return [self._summarize(scores) for scores in self._predict_scores_batch(batch)]
+
+    def _summarize(self, scores: np.ndarray) -> YamnetScores:
         if scores.size == 0:
             return YamnetScores(fire_alarm=0.0, car_horn=0.0, siren=0.0, top=[])
 
         # Aggregate across frames.
-        mx = scores.max(axis=0)
-
-        def safe_max(idxs: tuple[int, ...]) -> float:
-            best = 0.0
-            for i in idxs:
-                if 0 <= i < mx.size:
-                    best = max(best, float(mx[i]))
-            return best
-
-        fire = safe_max(self._fire_idxs)
-        horn = safe_max(self._horn_idxs)
-        siren = safe_max(self._siren_idxs)
+        if self._mx_buf is None or self._mx_buf.shape[0] != scores.shape[1]:
+            self._mx_buf = np.empty((scores.shape[1],), dtype=np.float32)
+        mx = np.max(scores, axis=0, out=self._mx_buf)
+
+        if self._alarm_idx_classes != mx.size:
+            self._alarm_idx_arrays = tuple(
+                np.asarray([i for i in idxs if 0 <= i < mx.size], dtype=np.intp)
+                for idxs in (self._fire_idxs, self._horn_idxs, self._siren_idxs)
+            )
+            self._alarm_idx_classes = int(mx.size)
+        fire_idx, horn_idx, siren_idx = self._alarm_idx_arrays
+        fire = float(mx[fire_idx].max(initial=0.0))
+        horn = float(mx[horn_idx].max(initial=0.0))
+        siren = float(mx[siren_idx].max(initial=0.0))
 
         top: list[tuple[str, float]] = []
         if self._topk > 0:
             k = min(self._topk, int(mx.size))
-            order = np.argsort(mx)[::-1][:k]
+            # Partial selection of the k best, then sort only those (521 classes, k ~ 5).
+            idx = np.argpartition(mx, -k)[-k:]
+            order = idx[np.argsort(mx[idx])[::-1]]
             for i in order:
                 name = self._class_names[int(i)] if 0 <= int(i) < len(self._class_names) else f"class_{int(i)}"
                 top.append((name, float(mx[int(i)])))
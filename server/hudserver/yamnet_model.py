@@ -44,12 +44,14 @@ class _WaveformToLogMelPatches(tf_keras.layers.Layer):
         self._mel_matrix = None
 
     def build(self, input_shape):  # noqa: ANN001
+        # Built once in float32 (the STFT magnitude dtype), so call() uses it as-is.
         self._mel_matrix = tf.signal.linear_to_mel_weight_matrix(
             num_mel_bins=int(self._p.mel_bins),
             num_spectrogram_bins=int(self._spectrogram_bins),
             sample_rate=int(self._p.sample_rate_hz),
             lower_edge_hertz=float(self._p.mel_min_hz),
             upper_edge_hertz=float(self._p.mel_max_hz),
+            dtype=tf.float32,
         )
         super().build(input_shape)
 
@@ -68,7 +70,7 @@ class _WaveformToLogMelPatches(tf_keras.layers.Layer):
         )
         magnitude_spectrogram = tf.abs(stft)
 
-        mel = tf.matmul(magnitude_spectrogram, tf.cast(self._mel_matrix, magnitude_spectrogram.dtype))
+        mel = tf.matmul(magnitude_spectrogram, self._mel_matrix)
 
         log_mel = tf.math.log(mel + tf.cast(self._p.log_offset, mel.dtype))
 
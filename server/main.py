@@ -4,7 +4,7 @@ import argparse
 import asyncio
 import os
 
-from hudserver.server import HudServer
+from hudserver.server import HudServer, _parse_bool
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -23,6 +23,14 @@ async def _amain() -> int:
 
 
 def main() -> None:
+    # Prefer uvloop when installed (USE_UVLOOP=0 to opt out); it's a drop-in, faster event loop.
+    if _parse_bool(os.environ.get("USE_UVLOOP"), default=True):
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            raise SystemExit(uvloop.run(_amain()))
     raise SystemExit(asyncio.run(_amain()))
 
 
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import math
+import unittest
+
+import numpy as np
+
+from hudserver.audio_features import BandEnergyWindow
+
+SAMPLE_RATE_HZ = 16000
+FRAME = 320  # 20 ms
+WINDOW = 5 * FRAME
+BANDS = ((500.0, 1500.0), (2000.0, 4000.0))
+
+
+def _direct(frames: list[np.ndarray]) -> tuple[float, tuple[float, ...]]:
+    """RMS and band ratios over ``frames``, each frame Hann-windowed and transformed on its own."""
+    energy = sum(float(np.dot(f.astype(np.float64), f.astype(np.float64))) for f in frames)
+    n = sum(f.size for f in frames)
+    total = 0.0
+    bands = [0.0] * len(BANDS)
+    for f in frames:
+        spec = np.fft.rfft(f.astype(np.float64) * np.hanning(f.size))
+        power = spec.real**2 + spec.imag**2
+        freqs = np.fft.rfftfreq(f.size, d=1.0 / SAMPLE_RATE_HZ)
+        total += float(power.sum())
+        for i, (lo, hi) in enumerate(BANDS):
+            bands[i] += float(power[(freqs >= lo) & (freqs <= hi)].sum())
+    return math.sqrt(energy / n), tuple(b / (total + 1e-12) for b in bands)
+
+
+class BandEnergyWindowTest(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(7)
+        t = np.arange(FRAME) / SAMPLE_RATE_HZ
+        # Varying mix of a 1 kHz tone, a 3 kHz tone and noise so every frame differs.
+        self.frames = [
+            (
+                0.3 * (k % 4) * np.sin(2 * np.pi * 1000 * t + k)
+                + 0.2 * ((k + 1) % 3) * np.sin(2 * np.pi * 3000 * t)
+                + 0.05 * rng.standard_normal(FRAME)
+            ).astype(np.float32)
+            for k in range(23)
+        ]
+
+    def _assert_matches(self, win: BandEnergyWindow, frames: list[np.ndarray]) -> None:
+        rms, ratios = _direct(frames)
+        self.assertAlmostEqual(win.rms(), rms, places=5)
+        for got, want in zip(win.band_ratios(), ratios):
+            self.assertAlmostEqual(got, want, places=5)
+
+    def test_running_sums_match_direct_computation_after_eviction(self) -> None:
+        win = BandEnergyWindow(SAMPLE_RATE_HZ, WINDOW, BANDS)
+        for k, frame in enumerate(self.frames):
+            win.push(frame)
+            self.assertEqual(win.filled, (k + 1) * FRAME >= WINDOW)
+            # Only the newest WINDOW samples' worth of frames are still in the window.
+            self._assert_matches(win, self.frames[max(0, k + 1 - WINDOW // FRAME) : k + 1])
+
+    def test_clear(self) -> None:
+        win = BandEnergyWindow(SAMPLE_RATE_HZ, WINDOW, BANDS)
+        for frame in self.frames[:8]:
+            win.push(frame)
+        win.clear()
+        self.assertFalse(win.filled)
+        self.assertEqual(win.rms(), 0.0)
+        self.assertEqual(win.band_ratios(), (0.0, 0.0))
+
+        for frame in self.frames[8:11]:
+            win.push(frame)
+        self._assert_matches(win, self.frames[8:11])
+
+
+if __name__ == "__main__":
+    unittest.main()
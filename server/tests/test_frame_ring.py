@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import unittest
+
+from hudserver.server import _FrameRing
+
+
+def _frame(i: int) -> bytes:
+    return i.to_bytes(2, "little") * 4
+
+
+class FrameRingTest(unittest.IsolatedAsyncioTestCase):
+    async def test_slow_reader_drops_oldest_without_affecting_fast_reader(self) -> None:
+        ring = _FrameRing(10)
+        fast = ring.reader()
+        slow = ring.reader(max_backlog=3)
+
+        fast_seen: list[bytes] = []
+        for i in range(8):
+            ring.push(_frame(i))
+            fast_seen.append(await fast.get())
+
+        self.assertEqual(fast_seen, [_frame(i) for i in range(8)])
+        self.assertEqual(fast.qsize(), 0)
+        # The slow reader never read: only its newest 3 frames survive, oldest first.
+        self.assertEqual([slow.get_nowait() for _ in range(3)], [_frame(5), _frame(6), _frame(7)])
+        with self.assertRaises(asyncio.QueueEmpty):
+            slow.get_nowait()
+
+    async def test_qsize_and_full_as_reported_in_status(self) -> None:
+        ring = _FrameRing(6)
+        stt = ring.reader()
+        rms = ring.reader(max_backlog=2)
+        self.assertEqual((stt.qsize(), stt.full()), (0, False))
+
+        for i in range(4):
+            ring.push(_frame(i))
+        self.assertEqual((stt.qsize(), stt.full()), (4, False))
+        # A reader's backlog is capped at its own limit.
+        self.assertEqual((rms.qsize(), rms.full()), (2, True))
+
+        for i in range(4, 10):
+            ring.push(_frame(i))
+        self.assertEqual((stt.qsize(), stt.full()), (6, True))
+        self.assertEqual(stt.get_nowait(), _frame(4))
+        self.assertEqual((stt.qsize(), stt.full()), (5, False))
+
+    async def test_get_within_times_out_with_none(self) -> None:
+        ring = _FrameRing(4)
+        reader = ring.reader()
+
+        t0 = time.monotonic()
+        self.assertIsNone(await reader.get_within(0.05))
+        self.assertGreaterEqual(time.monotonic() - t0, 0.04)
+
+        # A frame already queued is returned without waiting; one pushed mid-wait wakes it.
+        ring.push(_frame(1))
+        self.assertEqual(await reader.get_within(0.05), _frame(1))
+        asyncio.get_running_loop().call_later(0.01, ring.push, _frame(2))
+        self.assertEqual(await reader.get_within(1.0), _frame(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import importlib.util
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "tools")))
+
+import yamnet_tflite_export  # noqa: E402
+
+from hudserver.yamnet_detector import YamnetDetector  # noqa: E402
+
+HAS_TF = importlib.util.find_spec("tensorflow") is not None
+
+
+class TfliteExportToolTest(unittest.TestCase):
+    def test_defaults(self) -> None:
+        args = yamnet_tflite_export.build_parser().parse_args([])
+        self.assertIsNone(args.model)
+        self.assertIsNone(args.out)
+        self.assertEqual(args.window_s, 1.0)
+        self.assertEqual(args.rep_wav, [])
+
+    def test_repeatable_rep_wav(self) -> None:
+        args = yamnet_tflite_export.build_parser().parse_args(
+            ["--out", "/tmp/y.tflite", "--window-s", "0.96", "--rep-wav", "a.wav", "--rep-wav", "b.wav"]
+        )
+        self.assertEqual(args.out, "/tmp/y.tflite")
+        self.assertEqual(args.window_s, 0.96)
+        self.assertEqual(args.rep_wav, ["a.wav", "b.wav"])
+
+
+@unittest.skipUnless(HAS_TF, "TensorFlow is not installed")
+class YamnetBackendSelectionTest(unittest.TestCase):
+    def test_tflite_path_uses_tflite_interpreter(self) -> None:
+        det = YamnetDetector(model_path="/nonexistent/yamnet.tflite")
+        with mock.patch.object(YamnetDetector, "_load_tflite") as load_tflite:
+            det.load()
+        load_tflite.assert_called_once()
+
+    def test_h5_path_does_not_use_tflite(self) -> None:
+        det = YamnetDetector(model_path="/nonexistent/yamnet.h5")
+        with mock.patch.object(YamnetDetector, "_load_tflite") as load_tflite:
+            # The missing weights file fails the Keras path; it must not fall through to TFLite.
+            with self.assertRaises(Exception):
+                det.load()
+        load_tflite.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,7 +6,9 @@ import json
 import math
 import time
 import wave
+from fractions import Fraction
 
+import numpy as np
 import websockets
 
 
@@ -32,26 +34,45 @@ def _read_pcm16_frames(wav_path: str, sample_rate: int, frame_ms: int):
             raise SystemExit("WAV must be 16-bit PCM")
         if wf.getframerate() != sample_rate:
             raise SystemExit(f"WAV sample rate must be {sample_rate}Hz (got {wf.getframerate()}Hz)")
-        frames_per_chunk = int(sample_rate * (frame_ms / 1000.0))
-        while True:
-            chunk = wf.readframes(frames_per_chunk)
-            if not chunk:
-                break
-            yield chunk
+        pcm = wf.readframes(wf.getnframes())
+    # One read, then zero-copy slices (websockets sends memoryviews as-is).
+    step = int(sample_rate * (frame_ms / 1000.0)) * 2
+    view = memoryview(pcm)
+    for off in range(0, len(pcm), step):
+        yield view[off : off + step]
 
 
 def _gen_tone_frames(sample_rate: int, frame_ms: int, tone_hz: float, amplitude: float, duration_s: float):
     frames_per_chunk = int(sample_rate * (frame_ms / 1000.0))
     total_samples = int(sample_rate * duration_s)
     amp = max(0.0, min(1.0, amplitude))
-    two_pi_f = 2.0 * math.pi * tone_hz
+    phase_inc = 2.0 * math.pi * tone_hz / sample_rate
+
+    # Common test tones repeat exactly after a whole number of samples (440 Hz at 16 kHz: 400).
+    # Then precompute one period (+ one frame, so slices never wrap) and just slice it.
+    freq = Fraction(tone_hz).limit_denominator(1000)
+    if freq > 0 and float(freq) == tone_hz:
+        period = (sample_rate * freq.denominator) // math.gcd(sample_rate * freq.denominator, freq.numerator)
+        if period <= 10 * sample_rate:
+            table = (np.sin(phase_inc * np.arange(period + frames_per_chunk)) * (amp * 32767.0)).astype("<i2")
+            for start in range(0, total_samples, frames_per_chunk):
+                n = min(total_samples, start + frames_per_chunk) - start
+                offset = start % period
+                yield table[offset : offset + n].tobytes()
+            return
+
+    # Otherwise rotate one precomputed frame of phasors instead of evaluating sin per sample:
+    # frame k is Im(rotor * e^{i*w*k*N}), i.e. one complex multiply per sample.
+    rotor = np.exp(1j * phase_inc * np.arange(frames_per_chunk)) * (amp * 32767.0)
+    step = complex(math.cos(phase_inc * frames_per_chunk), math.sin(phase_inc * frames_per_chunk))
+    phase = 1.0 + 0.0j
     for start in range(0, total_samples, frames_per_chunk):
-        end = min(total_samples, start + frames_per_chunk)
-        buf = bytearray()
-        for i in range(start, end):
-            s = int(math.sin(two_pi_f * (i / sample_rate)) * amp * 32767.0)
-            buf += int(s).to_bytes(2, byteorder="little", signed=True)
-        yield bytes(buf)
+        n = min(total_samples, start + frames_per_chunk) - start
+        samples = (rotor[:n] * phase).imag.astype("<i2")
+        # Renormalize so rounding in the running product doesn't drift the amplitude.
+        phase *= step
+        phase /= abs(phase)
+        yield samples.tobytes()
 
 
 async def main() -> None:
@@ -61,7 +82,9 @@ async def main() -> None:
     if args.wav and args.tone_hz:
         raise SystemExit("Provide only one of --wav or --tone-hz")
     uri = f"{args.server}?deviceId={args.device_id}&role={args.role}"
-    async with websockets.connect(uri, max_size=2 * 1024 * 1024) as ws:
+    # No permessage-deflate: hudserver serves /esp32/audio with compression=None, so the offer
+    # would just be declined (and a real ESP32 doesn't offer it either).
+    async with websockets.connect(uri, max_size=2 * 1024 * 1024, compression=None) as ws:
         hello = {
             "v": 1,
             "type": "hello",
@@ -81,10 +104,21 @@ async def main() -> None:
         for frame in frames:
             await ws.send(frame)
             next_time += frame_s
-            sleep = next_time - time.monotonic()
+            now = time.monotonic()
+            sleep = next_time - now
             if sleep > 0:
                 await asyncio.sleep(sleep)
+            elif sleep < -0.1:
+                # Fell more than 100 ms behind (stall/backpressure): resync instead of bursting
+                # the backlog at the server.
+                next_time = now
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        # Faster loop for the socket I/O and frame-pacing timers (requirements.txt, non-Windows).
+        uvloop.run(main())
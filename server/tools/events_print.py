@@ -14,7 +14,7 @@ def build_parser() -> argparse.ArgumentParser:
 
 async def main() -> None:
     args = build_parser().parse_args()
-    async with websockets.connect(args.url) as ws:
+    async with websockets.connect(args.url, compression=None) as ws:
         async for msg in ws:
             print(msg)
 
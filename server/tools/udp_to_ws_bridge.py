@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import functools
 import json
 import logging
 import socket
+from collections import deque
 from dataclasses import dataclass
 from typing import Literal
 
@@ -21,13 +23,49 @@ class RoleCfg:
     device_id: str
 
 
+class _FrameQueue:
+    """Bounded drop-oldest frame queue: a deque(maxlen) plus a wake-up Event (single consumer)."""
+
+    def __init__(self, maxlen: int) -> None:
+        self._frames: deque[bytes] = deque(maxlen=max(1, int(maxlen)))
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def push(self, frame: bytes) -> bool:
+        """Append a frame; returns True if the oldest frame was dropped to make room."""
+        dropped = len(self._frames) == self._frames.maxlen
+        self._frames.append(frame)
+        self._ready.set()
+        return dropped
+
+    def pop_nowait(self) -> bytes:
+        return self._frames.popleft()
+
+    def clear(self) -> int:
+        n = len(self._frames)
+        self._frames.clear()
+        return n
+
+    async def get(self) -> bytes:
+        while not self._frames:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._frames.popleft()
+
+
 class _UdpProtocol(asyncio.DatagramProtocol):
-    def __init__(self, *, role: Role, udp_port: int, queue: asyncio.Queue[bytes], chunk_bytes: int) -> None:
+    def __init__(self, *, role: Role, udp_port: int, queue: _FrameQueue, chunk_bytes: int) -> None:
         self._role = role
         self._port = int(udp_port)
         self._queue = queue
         self._chunk_bytes = int(chunk_bytes)
-        self._buf = bytearray()
+        # Fixed ring of pending PCM (allocated once); bounds buffering to 40 chunks.
+        self._ring = bytearray(self._chunk_bytes * 40)
+        self._ring_mv = memoryview(self._ring)
+        self._r = 0  # read position
+        self._count = 0  # pending bytes
         self._packets = 0
         self._last_sender = None
         self._total_received = 0
@@ -35,45 +73,61 @@ class _UdpProtocol(asyncio.DatagramProtocol):
         self._total_dropped_bytes = 0
         self._frames_dropped_queue = 0
         self._last_log_s = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
 
     def datagram_received(self, data: bytes, addr) -> None:  # type: ignore[override]
         if not data:
             return
         self._packets += 1
         self._total_received += len(data)
-        self._buf.extend(data)
         self._last_sender = addr
 
+        ring = self._ring_mv
+        cap = len(self._ring)
+        data_mv = memoryview(data)
         # PCM16 alignment guard: if sender produces odd-length datagrams (or drops bytes),
-        # keep the stream aligned by dropping a trailing byte.
-        if (len(self._buf) % 2) != 0:
+        # keep the stream aligned by dropping a trailing byte (pending bytes are always even).
+        if (len(data_mv) % 2) != 0:
             self._total_dropped_bytes += 1
-            self._buf.pop()
-
-        # Avoid unbounded growth if the sender bursts or chunking is mismatched.
-        max_buf = self._chunk_bytes * 40
-        if len(self._buf) > max_buf:
-            drop = len(self._buf) - max_buf
-            self._total_dropped_bytes += int(drop)
-            del self._buf[:drop]
-
-        while len(self._buf) >= self._chunk_bytes:
-            chunk = bytes(self._buf[: self._chunk_bytes])
-            del self._buf[: self._chunk_bytes]
-            if self._queue.full():
-                try:
-                    _ = self._queue.get_nowait()
-                    self._frames_dropped_queue += 1
-                except asyncio.QueueEmpty:
-                    pass
-            try:
-                self._queue.put_nowait(chunk)
-                self._total_emitted += len(chunk)
-            except asyncio.QueueFull:
+            data_mv = data_mv[:-1]
+        if len(data_mv) > cap:
+            # Datagram larger than the whole ring: only its newest bytes can be kept.
+            skip = len(data_mv) - cap
+            self._total_dropped_bytes += self._count + skip
+            self._r = 0
+            self._count = 0
+            data_mv = data_mv[skip:]
+        overflow = self._count + len(data_mv) - cap
+        if overflow > 0:
+            # Avoid unbounded latency if the sender bursts or chunking is mismatched: drop oldest.
+            self._total_dropped_bytes += overflow
+            self._r = (self._r + overflow) % cap
+            self._count -= overflow
+
+        # Copy in at the write position, wrapping once at most.
+        w = (self._r + self._count) % cap
+        first = min(len(data_mv), cap - w)
+        ring[w : w + first] = data_mv[:first]
+        if first < len(data_mv):
+            ring[: len(data_mv) - first] = data_mv[first:]
+        self._count += len(data_mv)
+
+        chunk_bytes = self._chunk_bytes
+        while self._count >= chunk_bytes:
+            r = self._r
+            if r + chunk_bytes <= cap:
+                chunk = bytes(ring[r : r + chunk_bytes])
+            else:
+                chunk = bytes(ring[r:]) + bytes(ring[: chunk_bytes - (cap - r)])
+            self._r = (r + chunk_bytes) % cap
+            self._count -= chunk_bytes
+            if self._queue.push(chunk):
                 self._frames_dropped_queue += 1
-                pass
+            self._total_emitted += len(chunk)
 
-        loop = asyncio.get_running_loop()
+        loop = self._loop
+        if loop is None:
+            loop = self._loop = asyncio.get_running_loop()
         now = loop.time()
         if (now - self._last_log_s) >= 2.0:
             self._last_log_s = now
@@ -86,13 +140,14 @@ class _UdpProtocol(asyncio.DatagramProtocol):
                 self._total_emitted,
                 self._total_dropped_bytes,
                 self._frames_dropped_queue,
-                len(self._buf),
-                self._queue.qsize(),
+                self._count,
+                len(self._queue),
             )
             if self._last_sender is not None:
                 logging.getLogger("udp_bridge").info("UDP %s lastSender=%s", self._role, self._last_sender)
 
     def connection_made(self, transport: asyncio.BaseTransport) -> None:  # type: ignore[override]
+        self._loop = asyncio.get_running_loop()
         sock = transport.get_extra_info("socket")
         if isinstance(sock, socket.socket):
             self._port = sock.getsockname()[1]
@@ -102,46 +157,52 @@ async def _ws_sender(
     *,
     server_base: str,
     cfg: RoleCfg,
-    queue: asyncio.Queue[bytes],
+    queue: _FrameQueue,
     sample_rate_hz: int,
     frame_ms: int,
+    batch_frames: int,
 ) -> None:
     log = logging.getLogger("udp_bridge")
     uri = f"{server_base.rstrip('/')}/esp32/audio?deviceId={cfg.device_id}&role={cfg.role}"
+    # Serialized once; resent verbatim on every reconnect.
+    hello = json.dumps(
+        {
+            "v": 1,
+            "type": "hello",
+            "deviceId": cfg.device_id,
+            "role": cfg.role,
+            "fwVersion": "udp_bridge",
+            "audio": {"format": "pcm_s16le", "sampleRateHz": sample_rate_hz, "channels": 1, "frameMs": frame_ms},
+        }
+    )
     backoff_s = 0.5
     while True:
         try:
             async with websockets.connect(
                 uri,
                 max_size=2 * 1024 * 1024,
+                compression=None,  # forwarded as-is; hudserver doesn't negotiate deflate on /esp32/audio
                 open_timeout=5,
                 ping_interval=20,
                 ping_timeout=20,
             ) as ws:
-                hello = {
-                    "v": 1,
-                    "type": "hello",
-                    "deviceId": cfg.device_id,
-                    "role": cfg.role,
-                    "fwVersion": "udp_bridge",
-                    "audio": {"format": "pcm_s16le", "sampleRateHz": sample_rate_hz, "channels": 1, "frameMs": frame_ms},
-                }
-                await ws.send(json.dumps(hello))
+                await ws.send(hello)
                 log.info("WS connected role=%s deviceId=%s -> %s", cfg.role, cfg.device_id, uri)
                 backoff_s = 0.5
 
-                drained = 0
-                while not queue.empty():
-                    try:
-                        _ = queue.get_nowait()
-                        drained += 1
-                    except asyncio.QueueEmpty:
-                        break
+                drained = queue.clear()
                 if drained:
                     log.info("WS role=%s drained=%d stale frames before send loop", cfg.role, drained)
 
                 while True:
                     chunk = await queue.get()
+                    if batch_frames > 1 and queue:
+                        # Coalesce frames that are already waiting into one message (no extra
+                        # latency; the server splits it back into frames).
+                        batch = [chunk]
+                        while len(batch) < batch_frames and queue:
+                            batch.append(queue.pop_nowait())
+                        chunk = b"".join(batch)
                     await ws.send(chunk)
         except asyncio.CancelledError:
             raise
@@ -172,6 +233,18 @@ async def main() -> None:
         default=50,
         help="Max queued audio frames per role (lower = lower latency under load; default 50 ~= 1s at 20ms)",
     )
+    parser.add_argument(
+        "--batch-frames",
+        type=int,
+        default=8,
+        help="Max queued frames to coalesce into one WS message when the sender falls behind (1 = one frame per message)",
+    )
+    parser.add_argument(
+        "--udp-rcvbuf-bytes",
+        type=int,
+        default=4 * 1024 * 1024,
+        help="Requested SO_RCVBUF per UDP socket so bursts survive WS stalls (kernel may clamp; 0 = OS default)",
+    )
     parser.add_argument("--log-level", default="INFO")
     args = parser.parse_args()
 
@@ -202,18 +275,32 @@ async def main() -> None:
     right_cfg = RoleCfg(role="right", udp_port=int(args.right_port), device_id=str(args.right_device_id))
 
     queue_max_frames = max(1, int(args.queue_max_frames))
-    left_q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=queue_max_frames)
-    right_q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=queue_max_frames)
+    batch_frames = max(1, int(args.batch_frames))
+    left_q = _FrameQueue(queue_max_frames)
+    right_q = _FrameQueue(queue_max_frames)
 
     loop = asyncio.get_running_loop()
-    left_transport, _ = await loop.create_datagram_endpoint(
-        lambda: _UdpProtocol(role="left", udp_port=left_cfg.udp_port, queue=left_q, chunk_bytes=chunk_bytes),
-        local_addr=("0.0.0.0", left_cfg.udp_port),
-    )
-    right_transport, _ = await loop.create_datagram_endpoint(
-        lambda: _UdpProtocol(role="right", udp_port=right_cfg.udp_port, queue=right_q, chunk_bytes=chunk_bytes),
-        local_addr=("0.0.0.0", right_cfg.udp_port),
-    )
+    transports: dict[Role, asyncio.DatagramTransport] = {}
+    for cfg, q in ((left_cfg, left_q), (right_cfg, right_q)):
+        transports[cfg.role], _ = await loop.create_datagram_endpoint(
+            functools.partial(_UdpProtocol, role=cfg.role, udp_port=cfg.udp_port, queue=q, chunk_bytes=chunk_bytes),
+            local_addr=("0.0.0.0", cfg.udp_port),
+        )
+    left_transport = transports["left"]
+    right_transport = transports["right"]
+
+    rcvbuf = int(args.udp_rcvbuf_bytes)
+    if rcvbuf > 0:
+        for role, transport in transports.items():
+            sock = transport.get_extra_info("socket")
+            if sock is None:
+                continue
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+            except OSError as e:
+                log.warning("UDP %s: SO_RCVBUF=%d failed (%s)", role, rcvbuf, e)
+            # Linux caps at net.core.rmem_max (and reports double the usable size); log what stuck.
+            log.info("UDP %s SO_RCVBUF requested=%d actual=%d", role, rcvbuf, sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF))
 
     log.info(
         "Listening UDP left=%d right=%d -> %s (frame_ms=%d sample_rate=%d chunk_bytes=%d queue_max_frames=%d)",
@@ -228,8 +315,22 @@ async def main() -> None:
 
     try:
         await asyncio.gather(
-            _ws_sender(server_base=server_base, cfg=left_cfg, queue=left_q, sample_rate_hz=sample_rate_hz, frame_ms=frame_ms),
-            _ws_sender(server_base=server_base, cfg=right_cfg, queue=right_q, sample_rate_hz=sample_rate_hz, frame_ms=frame_ms),
+            _ws_sender(
+                server_base=server_base,
+                cfg=left_cfg,
+                queue=left_q,
+                sample_rate_hz=sample_rate_hz,
+                frame_ms=frame_ms,
+                batch_frames=batch_frames,
+            ),
+            _ws_sender(
+                server_base=server_base,
+                cfg=right_cfg,
+                queue=right_q,
+                sample_rate_hz=sample_rate_hz,
+                frame_ms=frame_ms,
+                batch_frames=batch_frames,
+            ),
         )
     finally:
         left_transport.close()
@@ -237,4 +338,10 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        # Faster loop for the UDP datagram callbacks and WS writes (requirements.txt, non-Windows).
+        uvloop.run(main())
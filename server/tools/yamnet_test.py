@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+import math
 import os
 import sys
 import wave
@@ -11,6 +12,11 @@ sys.path.append(os.path.normpath(os.path.join(os.path.dirname(__file__), "..")))
 
 from hudserver.yamnet_detector import YamnetDetector
 
+try:
+    from scipy.signal import resample_poly
+except ImportError:  # Optional: fall back to linear interpolation.
+    resample_poly = None
+
 
 def _read_wav(path: str) -> tuple[np.ndarray, int]:
     with wave.open(path, "rb") as wf:
@@ -20,27 +26,47 @@ def _read_wav(path: str) -> tuple[np.ndarray, int]:
         if sampwidth != 2:
             raise SystemExit(f"Unsupported WAV sample width: {sampwidth} bytes (need 16-bit PCM)")
         frames = wf.readframes(wf.getnframes())
-    pcm = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+    raw = np.frombuffer(frames, dtype=np.int16)
     if channels == 2:
-        pcm = pcm.reshape((-1, 2))
-        pcm = 0.5 * (pcm[:, 0] + pcm[:, 1])
-    elif channels != 1:
+        # Downmix in the integer domain (L+R fits int32 exactly), then one half-size float32 buffer.
+        n = raw.size // 2
+        pcm = np.add(raw[0 : 2 * n : 2], raw[1 : 2 * n : 2], dtype=np.int32).astype(np.float32)
+        pcm *= np.float32(1.0 / 65536.0)
+    elif channels == 1:
+        pcm = raw.astype(np.float32)
+        pcm *= np.float32(1.0 / 32768.0)
+    else:
         raise SystemExit(f"Unsupported WAV channels: {channels} (need mono or stereo)")
-    return pcm.astype(np.float32, copy=False), sample_rate
+    return pcm, sample_rate
 
 
-def _resample_linear(x: np.ndarray, src_hz: int, dst_hz: int) -> np.ndarray:
+def _resample(x: np.ndarray, src_hz: int, dst_hz: int) -> np.ndarray:
     if src_hz == dst_hz:
         return x.astype(np.float32, copy=False)
     if x.size == 0:
         return x.astype(np.float32, copy=False)
-    src_hz_f = float(src_hz)
-    dst_hz_f = float(dst_hz)
-    src_t = np.arange(x.size, dtype=np.float32) / src_hz_f
-    dst_n = int(round(float(x.size) * dst_hz_f / src_hz_f))
-    dst_t = np.arange(dst_n, dtype=np.float32) / dst_hz_f
-    y = np.interp(dst_t, src_t, x).astype(np.float32, copy=False)
-    return np.clip(y, -1.0, 1.0).astype(np.float32, copy=False)
+    if resample_poly is not None:
+        # Band-limited polyphase FIR (no aliasing on 44.1/48 kHz -> 16 kHz).
+        g = math.gcd(int(src_hz), int(dst_hz))
+        y = resample_poly(x, int(dst_hz) // g, int(src_hz) // g).astype(np.float32, copy=False)
+        np.clip(y, -1.0, 1.0, out=y)
+        return y
+    # Linear interpolation in source-sample units, a block at a time: no full-length
+    # timestamp arrays, so the working set stays ~one output buffer for long files.
+    ratio = float(src_hz) / float(dst_hz)
+    dst_n = int(round(float(x.size) * float(dst_hz) / float(src_hz)))
+    y = np.empty((dst_n,), dtype=np.float32)
+    last = x.size - 1
+    block = 1 << 16
+    for start in range(0, dst_n, block):
+        pos = np.arange(start, min(dst_n, start + block), dtype=np.float64) * ratio
+        np.minimum(pos, float(last), out=pos)
+        i0 = pos.astype(np.intp)
+        i1 = np.minimum(i0 + 1, last)
+        frac = (pos - i0).astype(np.float32)
+        y[start : start + i0.size] = x[i0] + (x[i1] - x[i0]) * frac
+    np.clip(y, -1.0, 1.0, out=y)
+    return y
 
 
 def main() -> None:
@@ -49,13 +75,39 @@ def main() -> None:
     p.add_argument("--model", default=None, help="Path to resources/yamnet.h5 (optional)")
     p.add_argument("--class-map", default=None, help="Path to resources/yamnet_class_map.csv (optional)")
     p.add_argument("--topk", type=int, default=8)
+    p.add_argument(
+        "--window-s",
+        type=float,
+        help="Scan the file in windows of this many seconds (batched model calls) instead of one whole-file window",
+    )
+    p.add_argument("--batch", type=int, default=16, help="Windows per model call when scanning (default 16)")
     args = p.parse_args()
 
     pcm, sr = _read_wav(str(args.wav))
-    pcm16k = _resample_linear(pcm, sr, 16000)
+    pcm16k = _resample(pcm, sr, 16000)
 
     det = YamnetDetector(model_path=args.model, class_map_path=args.class_map, sample_rate_hz=16000, topk=int(args.topk))
     det.load()
+
+    if args.window_s:
+        win = int(round(float(args.window_s) * 16000))
+        if win <= 0:
+            raise SystemExit("--window-s must be > 0")
+        # Zero-pad the tail so every window has the same length and can share a batch.
+        n_win = max(1, math.ceil(pcm16k.size / win))
+        padded = np.zeros((n_win * win,), dtype=np.float32)
+        padded[: pcm16k.size] = pcm16k
+        windows = list(padded.reshape((n_win, win)))
+        batch = max(1, int(args.batch))
+        for start in range(0, n_win, batch):
+            for i, scores in enumerate(det.classify_batch(windows[start : start + batch]), start):
+                best = f"{scores.top[0][0]} ({scores.top[0][1]:.3f})" if scores.top else "-"
+                print(
+                    f"{i * win / 16000.0:8.2f}s  fire_alarm={scores.fire_alarm:.3f}  "
+                    f"car_horn={scores.car_horn:.3f}  siren={scores.siren:.3f}  top={best}"
+                )
+        return
+
     scores = det.classify_window(pcm16k)
 
     print(f"fire_alarm={scores.fire_alarm:.3f}  car_horn={scores.car_horn:.3f}  siren={scores.siren:.3f}")
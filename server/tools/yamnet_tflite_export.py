@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import wave
+
+import numpy as np
+
+sys.path.append(os.path.normpath(os.path.join(os.path.dirname(__file__), "..")))
+
+from hudserver.yamnet_detector import default_model_path
+
+
+def _read_wav_16k_mono(path: str) -> np.ndarray:
+    with wave.open(path, "rb") as wf:
+        if int(wf.getsampwidth()) != 2 or int(wf.getframerate()) != 16000:
+            raise SystemExit(f"{path}: representative WAVs must be 16kHz PCM16")
+        channels = int(wf.getnchannels())
+        frames = wf.readframes(wf.getnframes())
+    pcm = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+    if channels > 1:
+        pcm = pcm.reshape((-1, channels)).mean(axis=1)
+    return pcm.astype(np.float32, copy=False)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Convert resources/yamnet.h5 to a quantized TFLite model.")
+    p.add_argument("--model", default=None, help="Path to resources/yamnet.h5 (optional)")
+    p.add_argument("--out", default=None, help="Output path (default: next to the .h5 as yamnet.tflite)")
+    p.add_argument("--window-s", type=float, default=1.0, help="Fixed input window; match YAMNET_WINDOW_S")
+    p.add_argument(
+        "--rep-wav",
+        action="append",
+        default=[],
+        help="16kHz WAV for full int8 calibration (repeatable). Without it, weights-only int8 is used.",
+    )
+    return p
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+
+    import tensorflow as tf  # type: ignore
+
+    from hudserver.yamnet_model import yamnet_model
+
+    model_path = args.model or default_model_path()
+    out_path = args.out or os.path.join(os.path.dirname(model_path), "yamnet.tflite")
+    window_samples = int(round(16000 * float(args.window_s)))
+
+    model = yamnet_model()
+    model.load_weights(model_path)
+    # Fixed (1, window) signature: the server always classifies one window of YAMNET_WINDOW_S.
+    fn = tf.function(lambda x: model(x, training=False)).get_concrete_function(
+        tf.TensorSpec(shape=[1, window_samples], dtype=tf.float32)
+    )
+
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([fn], model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    # The STFT front end may need TF ops that have no TFLite builtin.
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS, tf.lite.OpsSet.SELECT_TF_OPS]
+
+    if args.rep_wav:
+        audio = np.concatenate([_read_wav_16k_mono(path) for path in args.rep_wav])
+        hop = max(1, window_samples // 2)
+
+        def representative_dataset():  # noqa: ANN202
+            for start in range(0, max(1, audio.size - window_samples + 1), hop):
+                window = audio[start : start + window_samples]
+                if window.size < window_samples:
+                    window = np.pad(window, (0, window_samples - window.size))
+                yield [window.reshape((1, -1))]
+
+        converter.representative_dataset = representative_dataset
+
+    tflite_model = converter.convert()
+    with open(out_path, "wb") as f:
+        f.write(tflite_model)
+    mode = "int8 (calibrated)" if args.rep_wav else "int8 weights"
+    print(f"Wrote {out_path} ({len(tflite_model) / 1e6:.1f} MB, {mode}, window={window_samples} samples)")
+    print(f"Use it with: YAMNET_MODEL_PATH={out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import math
+import os
+import random
+import time
+import unittest
+
+import numpy as np
+
+from usb_relay import _CaptureRing, _PolyphaseResampler
+
+
+def _tone(rate_hz: int, seconds: float, freq_hz: float, amplitude: float, channels: int = 1) -> np.ndarray:
+    t = np.arange(int(rate_hz * seconds)) / rate_hz
+    x = np.rint(np.sin(2.0 * np.pi * freq_hz * t) * amplitude).astype(np.int16)
+    return np.repeat(x[:, None], channels, axis=1)
+
+
+class PolyphaseResamplerTest(unittest.TestCase):
+    RATES = ((48000, 16000), (44100, 16000), (8000, 16000))
+
+    def test_chunked_matches_single_block(self) -> None:
+        rng = random.Random(1234)
+        for in_hz, out_hz in self.RATES:
+            with self.subTest(in_hz=in_hz, out_hz=out_hz):
+                x = _tone(in_hz, 1.0, 440.0, 12000.0, channels=2)
+                x[:, 1] //= 3
+                whole = _PolyphaseResampler(in_hz, out_hz, 2).process(x)
+
+                chunked_rs = _PolyphaseResampler(in_hz, out_hz, 2)
+                parts = []
+                pos = 0
+                while pos < x.shape[0]:
+                    n = rng.randint(1, 2000)
+                    parts.append(chunked_rs.process(x[pos : pos + n]))
+                    pos += n
+                chunked = np.concatenate(parts)
+
+                self.assertEqual(chunked.dtype, np.int16)
+                np.testing.assert_array_equal(chunked, whole)
+
+    def test_output_length(self) -> None:
+        for in_hz, out_hz in self.RATES:
+            with self.subTest(in_hz=in_hz, out_hz=out_hz):
+                x = _tone(in_hz, 1.0, 440.0, 1000.0)
+                out = _PolyphaseResampler(in_hz, out_hz, 1).process(x)
+                self.assertEqual(out.shape, (out_hz, 1))
+
+    def test_unity_gain_on_tone(self) -> None:
+        amplitude = 10000.0
+        for in_hz, out_hz in self.RATES:
+            with self.subTest(in_hz=in_hz, out_hz=out_hz):
+                out = _PolyphaseResampler(in_hz, out_hz, 1).process(_tone(in_hz, 1.0, 1000.0, amplitude))
+                # Skip the filter's start-up transient.
+                steady = out[out_hz // 10 :, 0].astype(np.float64)
+                rms = math.sqrt(float(np.mean(steady * steady)))
+                self.assertAlmostEqual(rms / (amplitude / math.sqrt(2.0)), 1.0, delta=0.02)
+
+
+class CaptureRingTest(unittest.TestCase):
+    def _drain(self, ring: _CaptureRing) -> bytes:
+        out = b""
+        while (view := ring.read(timeout=0)) is not None:
+            out += bytes(view)
+        return out
+
+    def test_round_trip_across_wraparound(self) -> None:
+        ring = _CaptureRing(capacity=1000, align=4, max_backlog=1000)
+        data = os.urandom(40 * 96)
+        got = b""
+        for i in range(40):
+            ring.write(memoryview(data)[i * 96 : (i + 1) * 96])
+            if i % 3 == 2:
+                got += self._drain(ring)
+        got += self._drain(ring)
+        self.assertEqual(got, data)
+        self.assertEqual(ring.dropped_blocks, 0)
+
+    def test_overflow_drops_blocks_and_backlog_trims_to_whole_frames(self) -> None:
+        # Stereo int16: 4-byte frames. 130 rounds down to a whole-frame backlog of 128 bytes.
+        ring = _CaptureRing(capacity=256, align=4, max_backlog=130)
+        blocks = [os.urandom(64) for _ in range(5)]
+        for b in blocks:
+            ring.write(b)
+        # Only 4 blocks fit; the producer drops the one that doesn't.
+        self.assertEqual(ring.dropped_blocks, 1)
+
+        got = self._drain(ring)
+        # The consumer skips the oldest audio down to max_backlog, on a frame boundary.
+        self.assertEqual(len(got), 128)
+        self.assertEqual(got, blocks[2] + blocks[3])
+
+    def test_read_times_out_with_none_when_empty(self) -> None:
+        ring = _CaptureRing(capacity=64, align=2, max_backlog=64)
+        t0 = time.monotonic()
+        self.assertIsNone(ring.read(timeout=0.05))
+        self.assertGreaterEqual(time.monotonic() - t0, 0.04)
+
+
+if __name__ == "__main__":
+    unittest.main()
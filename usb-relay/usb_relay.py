@@ -2,16 +2,19 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import audioop
+import collections
+import functools
 import json
 import logging
+import math
 import signal
 import threading
 import traceback
 from dataclasses import dataclass
-from typing import Literal
+from typing import Callable, Literal
 from urllib.parse import quote
 
+import numpy as np
 import websockets
 
 try:
@@ -45,15 +48,23 @@ def build_parser() -> argparse.ArgumentParser:
         default=50,
         help="Max queued output frames per role (lower = lower latency; default 50 ~= 1s at 20ms)",
     )
+    parser.add_argument(
+        "--capture-block-frames",
+        type=int,
+        default=2,
+        help="Frames of audio per capture callback (default 2; 1 = one callback per frame, lowest latency)",
+    )
+    parser.add_argument(
+        "--batch-frames",
+        type=int,
+        default=8,
+        help="Max queued frames to coalesce into one WS message when the sender falls behind (1 = one frame per message)",
+    )
     parser.add_argument("--log-level", default="INFO")
     return parser
 
 
-def _print_devices() -> None:
-    if sd is None:
-        raise SystemExit("sounddevice is not installed (pip install -r usb-relay/requirements.txt)")
-
-    devices = sd.query_devices()
+def _print_devices(devices) -> None:  # type: ignore[no-untyped-def]
     default_in = sd.default.device[0] if sd.default.device else None
     print("Input devices:")
     for i, d in enumerate(devices):
@@ -66,10 +77,7 @@ def _print_devices() -> None:
         print(f"[{i:2d}] ch={chans} defaultRate={rate} {name}{star}")
 
 
-def _resolve_device(device_arg: str | None) -> int | None:
-    if sd is None:
-        raise SystemExit("sounddevice is not installed (pip install -r usb-relay/requirements.txt)")
-
+def _resolve_device(device_arg: str | None, devices) -> int | None:  # type: ignore[no-untyped-def]
     if device_arg is None:
         return None
 
@@ -78,7 +86,6 @@ def _resolve_device(device_arg: str | None) -> int | None:
     except ValueError:
         idx = None
     if idx is not None:
-        devices = sd.query_devices()
         if idx < 0 or idx >= len(devices):
             raise SystemExit(f"--device index out of range: {idx}")
         if int(devices[idx].get("max_input_channels") or 0) <= 0:
@@ -89,7 +96,6 @@ def _resolve_device(device_arg: str | None) -> int | None:
     if not needle:
         return None
 
-    devices = sd.query_devices()
     matches: list[int] = []
     for i, d in enumerate(devices):
         if int(d.get("max_input_channels") or 0) <= 0:
@@ -130,30 +136,280 @@ class AudioCfg:
         return samples_per_frame * 2  # mono PCM16
 
 
-def _queue_put_drop_oldest(q: asyncio.Queue[bytes], frame: bytes) -> None:
-    if q.full():
-        try:
-            _ = q.get_nowait()
-        except asyncio.QueueEmpty:
-            pass
-    try:
-        q.put_nowait(frame)
-    except asyncio.QueueFull:
-        # Best-effort; drop frame.
-        pass
+class _FrameRing:
+    """Fixed-capacity FIFO of equal-size frames in one bytearray, dropping the oldest when full.
+
+    The producer fills the tail slot in place (``next_slot`` + ``commit``) and the
+    sender copies up to a batch of frames into its own scratch buffer, so no
+    per-frame objects are allocated and an overflow is a single index bump.
+    Both sides run on the event loop.
+    """
+
+    def __init__(self, capacity: int, frame_bytes: int) -> None:
+        self._buf = bytearray(capacity * frame_bytes)
+        self._view = memoryview(self._buf)
+        self._cap = capacity
+        self._frame_bytes = frame_bytes
+        self._head = 0
+        self._count = 0
+        self._event = asyncio.Event()
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def next_slot(self) -> memoryview:
+        """Writable view of the slot the next ``commit()`` publishes (evicts the oldest frame if full)."""
+        if self._count == self._cap:
+            self._head = (self._head + 1) % self._cap
+            self._count -= 1
+            self.dropped += 1
+        off = ((self._head + self._count) % self._cap) * self._frame_bytes
+        return self._view[off : off + self._frame_bytes]
+
+    def commit(self) -> None:
+        self._count += 1
+        self._event.set()
+
+    def clear(self) -> int:
+        n = self._count
+        self._head = (self._head + n) % self._cap
+        self._count = 0
+        return n
+
+    async def get_into(self, out: memoryview, max_frames: int) -> int:
+        """Wait for at least one frame, move up to ``max_frames`` into ``out``; returns bytes written."""
+        while not self._count:
+            self._event.clear()
+            await self._event.wait()
+        n = min(self._count, max_frames)
+        fb = self._frame_bytes
+        first = min(n, self._cap - self._head)
+        out[: first * fb] = self._view[self._head * fb : (self._head + first) * fb]
+        if first < n:
+            out[first * fb : n * fb] = self._view[: (n - first) * fb]
+        self._head = (self._head + n) % self._cap
+        self._count -= n
+        return n * fb
+
+
+class _CaptureRing:
+    """Single-producer/single-consumer byte ring from the PortAudio thread to the DSP thread.
+
+    The audio callback copies each block straight into a preallocated buffer and
+    only signals the consumer when it is parked, so while the DSP thread keeps
+    up a callback takes no lock and wakes nobody. Each counter has a single
+    writer; under the GIL plain int stores are enough.
+    """
+
+    def __init__(self, *, capacity: int, align: int, max_backlog: int) -> None:
+        capacity -= capacity % align
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._cap = capacity
+        self._align = align
+        self._max_backlog = max(align, max_backlog - max_backlog % align)
+        self._w = 0  # total bytes written (producer only)
+        self._r = 0  # total bytes consumed (consumer only)
+        self._held = 0  # bytes lent out by the last read() (consumer only)
+        self._waiting = False
+        self._event = threading.Event()
+        self.dropped_blocks = 0
+
+    def write(self, data) -> None:  # type: ignore[no-untyped-def]
+        """Producer side (audio thread). Drops the block if the ring is full."""
+        mv = memoryview(data).cast("B")
+        n = mv.nbytes
+        w = self._w
+        if n > self._cap - (w - self._r):
+            self.dropped_blocks += 1
+            return
+        pos = w % self._cap
+        first = min(n, self._cap - pos)
+        self._buf[pos : pos + first] = mv[:first]
+        if first < n:
+            self._buf[: n - first] = mv[first:]
+        self._w = w + n
+        if self._waiting:
+            self._waiting = False
+            self._event.set()
+
+    def read(self, timeout: float | None = None) -> memoryview | None:
+        """Consumer side (DSP thread). Returns the oldest buffered bytes as a view into the ring.
+
+        Returns ``None`` if nothing arrived within ``timeout``. The view is only
+        valid until the next ``read()``: its bytes are released back to the
+        producer then, so nothing is copied out in between.
+        """
+        self._r += self._held
+        self._held = 0
+        avail = self._w - self._r
+        if not avail:
+            self._event.clear()
+            self._waiting = True
+            # Re-check after publishing the flag so a concurrent write can't be missed.
+            if self._w == self._r:
+                self._event.wait(timeout)
+            self._waiting = False
+            avail = self._w - self._r
+            if not avail:
+                return None
+
+        if avail > self._max_backlog:
+            # Fell behind: skip the oldest audio instead of building latency.
+            skip = avail - self._max_backlog
+            self._r += skip
+            avail -= skip
+
+        # Only the contiguous run up to the end of the buffer; a wrapped tail comes next call.
+        start = self._r % self._cap
+        n = min(avail, self._cap - start)
+        self._held = n
+        return self._view[start : start + n]
+
+
+class _ChunkBuffer:
+    """FIFO of PCM chunks that hands out fixed-size frames.
+
+    Appending keeps a reference to the chunk and frames are copied out of
+    memoryview slices straight into the caller's frame slot, so pulling a frame
+    costs O(frame size) no matter how much is buffered (``del bytearray[:n]``
+    memmoves the whole remainder every frame).
+    """
+
+    __slots__ = ("_chunks", "size")
+
+    def __init__(self) -> None:
+        self._chunks: collections.deque[memoryview] = collections.deque()
+        self.size = 0
+
+    def append(self, data: bytes) -> None:
+        if data:
+            self._chunks.append(memoryview(data))
+            self.size += len(data)
+
+    def pop_into(self, dst: bytearray | memoryview) -> None:
+        """Move the first ``len(dst)`` bytes into ``dst``; caller guarantees ``size >= len(dst)``."""
+        chunks = self._chunks
+        n = len(dst)
+        off = 0
+        while off < n:
+            chunk = chunks.popleft()
+            take = min(len(chunk), n - off)
+            dst[off : off + take] = chunk[:take]
+            if take < len(chunk):
+                chunks.appendleft(chunk[take:])
+            off += take
+        self.size -= n
+
+
+class _PolyphaseResampler:
+    """Streaming polyphase FIR resampler for int16 blocks shaped ``(n, channels)``.
+
+    The rate ratio is reduced to ``up/down`` and a Kaiser-windowed sinc low-pass
+    (the design ``scipy.signal.resample_poly`` uses) is split into ``up`` phases
+    of ``taps`` coefficients once, at construction. Per block, every output is
+    one dot product of a window of input history with the coefficients of its
+    phase. The last ``taps - 1`` inputs and the exact read position carry over
+    between blocks, so the stream is filtered as if it were never chunked.
+    """
+
+    def __init__(self, in_rate_hz: int, out_rate_hz: int, channels: int, *, half_len: int = 10) -> None:
+        g = math.gcd(in_rate_hz, out_rate_hz)
+        up = out_rate_hz // g
+        down = in_rate_hz // g
+        max_rate = max(up, down)
+
+        # Low-pass at the narrower of the two Nyquist bands, evaluated at the upsampled rate.
+        n = 2 * half_len * max_rate + 1
+        taps = -(-n // up)
+        k = np.arange(n, dtype=np.float64) - (n - 1) / 2.0
+        h = np.sinc(k / max_rate) / max_rate * np.kaiser(n, 5.0) * up
+        h = np.concatenate((h, np.zeros(taps * up - n)))
+        # bank[p, j] weights input x[i - j] for outputs landing on phase p; reversed so that
+        # it lines up with an ascending window of history.
+        self._bank = np.ascontiguousarray(h.reshape(taps, up).T[:, ::-1], dtype=np.float32)
+        self._up = up
+        self._down = down
+        self._taps = taps
+        self._hist = np.zeros((taps - 1, channels), dtype=np.float32)
+        self._ext = np.empty((0, channels), dtype=np.float32)
+        self._phase = 0
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        """Resample ``x`` (int16, ``(n, channels)``) and return int16 in the same layout."""
+        n = x.shape[0]
+        up, down = self._up, self._down
+        span = n * up
+        # History + block in one reused float32 buffer; the int16 -> float32 cast happens
+        # during the copy instead of via a separate astype() temporary.
+        h = self._taps - 1
+        ext = self._ext
+        if ext.shape[0] != h + n:
+            ext = self._ext = np.empty((h + n, x.shape[1]), dtype=np.float32)
+        ext[:h] = self._hist
+        ext[h:] = x
+        self._hist[...] = ext[n:]
+        if self._phase >= span:
+            self._phase -= span
+            return np.empty((0, x.shape[1]), dtype=np.int16)
+
+        count = -(-(span - self._phase) // down)
+        # windows[i] is ext[i : i + taps] (per channel), i.e. the history ending at input i.
+        windows = np.lib.stride_tricks.sliding_window_view(ext, self._taps, axis=0)
+        if up == 1:
+            # Integer decimation (48k -> 16k): one phase, strided windows, a single matvec.
+            out = windows[self._phase :: down][:count] @ self._bank[0]
+        else:
+            pos = self._phase + down * np.arange(count)
+            idx = pos // up
+            out = np.einsum("mct,mt->mc", windows[idx], self._bank[pos - idx * up])
+        self._phase += count * down - span
+
+        np.rint(out, out=out)
+        np.clip(out, -32768, 32767, out=out)
+        return out.astype(np.int16)
+
+
+def _make_splitter(channels: int, role_mode: RoleMode) -> Callable[[np.ndarray], list[tuple[Role, bytes]]]:
+    """Pick the role split for this (channels, role mode) once, instead of branching per block."""
+    if channels == 2:
+        # Column views of the interleaved block; tobytes() is the only copy per role.
+        if role_mode == "both":
+            return lambda s: [("left", s[:, 0].tobytes()), ("right", s[:, 1].tobytes())]
+        col = 0 if role_mode == "left" else 1
+        return lambda s: [(role_mode, s[:, col].tobytes())]
+    if role_mode == "both":
+
+        def _dup(s: np.ndarray) -> list[tuple[Role, bytes]]:
+            mono = s.tobytes()
+            return [("left", mono), ("right", mono)]
+
+        return _dup
+    return lambda s: [(role_mode, s.tobytes())]
 
 
-async def _audio_process_loop(
+def _audio_dsp_loop(
     *,
-    input_q: asyncio.Queue[bytes],
-    out_by_role: dict[Role, asyncio.Queue[bytes]],
+    capture: _CaptureRing,
     cfg: AudioCfg,
     role_mode: RoleMode,
+    emit: Callable[[list[tuple[Role, bytes]]], None],
+    stop_flag: threading.Event,
 ) -> None:
+    """Resample and split captured audio into per-role mono PCM. Runs on its own thread.
+
+    Each capture block becomes one ``emit`` call carrying the PCM for every
+    active role, so the event loop only sees one handoff per block.
+    """
     log = logging.getLogger("usb_relay.audio")
-    rate_state = None
-    bufs: dict[Role, bytearray] = {r: bytearray() for r in out_by_role}
-    bytes_per_frame = cfg.bytes_per_frame
+    channels = cfg.input_channels
+    resampler = (
+        _PolyphaseResampler(cfg.input_sample_rate_hz, cfg.output_sample_rate_hz, channels)
+        if cfg.input_sample_rate_hz != cfg.output_sample_rate_hz
+        else None
+    )
+    split = _make_splitter(channels, role_mode)
 
     log.info(
         "Audio pipeline input=%sHz ch=%d -> output=%sHz mono frameMs=%d bytesPerFrame=%d roleMode=%s",
@@ -161,94 +417,86 @@ async def _audio_process_loop(
         cfg.input_channels,
         cfg.output_sample_rate_hz,
         cfg.frame_ms,
-        bytes_per_frame,
+        cfg.bytes_per_frame,
         role_mode,
     )
 
-    while True:
-        data = await input_q.get()
-
-        if cfg.input_sample_rate_hz != cfg.output_sample_rate_hz:
-            data, rate_state = audioop.ratecv(
-                data,
-                2,
-                cfg.input_channels,
-                cfg.input_sample_rate_hz,
-                cfg.output_sample_rate_hz,
-                rate_state,
-            )
+    read = capture.read
+    stopped = stop_flag.is_set
+    frombuffer = np.frombuffer
+    int16 = np.int16
+    resample = resampler.process if resampler is not None else None
 
-        if not data:
+    while not stopped():
+        data = read(timeout=0.2)
+        if data is None:
             continue
 
-        if cfg.input_channels == 2:
-            if role_mode in ("left", "both"):
-                bufs["left"].extend(audioop.tomono(data, 2, 1, 0))
-            if role_mode in ("right", "both"):
-                bufs["right"].extend(audioop.tomono(data, 2, 0, 1))
-        else:
-            if role_mode == "both":
-                bufs["left"].extend(data)
-                bufs["right"].extend(data)
-            elif role_mode == "left":
-                bufs["left"].extend(data)
-            else:
-                bufs["right"].extend(data)
-
-        for role, buf in bufs.items():
-            q = out_by_role.get(role)
-            if q is None:
-                continue
-            while len(buf) >= bytes_per_frame:
-                frame = bytes(buf[:bytes_per_frame])
-                del buf[:bytes_per_frame]
-                _queue_put_drop_oldest(q, frame)
-
-
-async def _ws_sender(*, server: str, role: Role, device_id: str, audio: AudioCfg, q: asyncio.Queue[bytes]) -> None:
+        samples = frombuffer(data, dtype=int16, count=len(data) // 2)
+        samples = samples[: samples.size - samples.size % channels].reshape(-1, channels)
+        if resample is not None:
+            samples = resample(samples)
+
+        if samples.size == 0:
+            continue
+
+        emit(split(samples))
+
+
+def _frame_output(
+    chunks: list[tuple[Role, bytes]],
+    *,
+    sinks: dict[Role, tuple[_ChunkBuffer, _FrameRing]],
+    bytes_per_frame: int,
+) -> None:
+    """Cut per-role PCM into frame_ms frames on the event loop."""
+    for role, pcm in chunks:
+        buf, ring = sinks[role]
+        buf.append(pcm)
+        if buf.size < bytes_per_frame:
+            continue
+        pop_into, next_slot, commit = buf.pop_into, ring.next_slot, ring.commit
+        while buf.size >= bytes_per_frame:
+            pop_into(next_slot())
+            commit()
+
+
+async def _ws_sender(
+    *,
+    uri: str,
+    role: Role,
+    device_id: str,
+    hello: str,
+    ring: _FrameRing,
+    frame_bytes: int,
+    batch_frames: int,
+) -> None:
     log = logging.getLogger(f"usb_relay.ws.{role}")
-    base = _esp32_audio_endpoint(server)
-    uri = f"{base}?deviceId={quote(device_id)}&role={quote(role)}"
+    scratch = memoryview(bytearray(frame_bytes * batch_frames))
     backoff_s = 0.5
     while True:
         try:
             async with websockets.connect(
                 uri,
                 max_size=2 * 1024 * 1024,
+                compression=None,  # hudserver declines deflate on /esp32/audio; noisy mic PCM barely shrinks anyway
                 open_timeout=5,
                 ping_interval=20,
                 ping_timeout=20,
             ) as ws:
-                hello = {
-                    "v": 1,
-                    "type": "hello",
-                    "deviceId": device_id,
-                    "role": role,
-                    "fwVersion": "usb_relay",
-                    "audio": {
-                        "format": "pcm_s16le",
-                        "sampleRateHz": audio.output_sample_rate_hz,
-                        "channels": 1,
-                        "frameMs": audio.frame_ms,
-                    },
-                }
-                await ws.send(json.dumps(hello, separators=(",", ":")))
+                await ws.send(hello)
                 log.info("WS connected deviceId=%s -> %s", device_id, uri)
                 backoff_s = 0.5
 
-                drained = 0
-                while not q.empty():
-                    try:
-                        _ = q.get_nowait()
-                        drained += 1
-                    except asyncio.QueueEmpty:
-                        break
+                drained = ring.clear()
                 if drained:
                     log.info("Drained %d stale frames before send loop", drained)
 
                 while True:
-                    frame = await q.get()
-                    await ws.send(frame)
+                    # Takes every frame already waiting (up to batch_frames) as one message; no extra
+                    # latency, and the server splits it back into frames.
+                    n = await ring.get_into(scratch, batch_frames)
+                    await ws.send(scratch[:n])
         except asyncio.CancelledError:
             raise
         except Exception as e:
@@ -265,13 +513,16 @@ async def main() -> None:
     )
     log = logging.getLogger("usb_relay")
 
-    if args.list_devices:
-        _print_devices()
-        return
-
     if sd is None:
         raise SystemExit("sounddevice is not installed (pip install -r usb-relay/requirements.txt)")
 
+    # Enumerating devices goes through PortAudio (slow with many USB devices): do it once.
+    devices = sd.query_devices()
+
+    if args.list_devices:
+        _print_devices(devices)
+        return
+
     role_mode: RoleMode = str(args.role)
     roles: list[Role]
     if role_mode == "both":
@@ -281,8 +532,15 @@ async def main() -> None:
     else:
         roles = ["right"]
 
-    device = _resolve_device(args.device)
-    dev_info = sd.query_devices(device, "input") if device is not None else sd.query_devices(kind="input")
+    device = _resolve_device(args.device, devices)
+    if device is not None:
+        dev_info = devices[device]
+    else:
+        default_in = sd.default.device[0] if sd.default.device else None
+        if isinstance(default_in, int) and 0 <= default_in < len(devices):
+            dev_info = devices[default_in]
+        else:
+            dev_info = sd.query_devices(kind="input")
     max_ch = int(dev_info.get("max_input_channels") or 0)
     if max_ch <= 0:
         raise SystemExit("Selected device has no input channels")
@@ -322,8 +580,8 @@ async def main() -> None:
         log.info("Input is mono; duplicating audio to both left/right roles")
 
     queue_max_frames = max(1, int(args.queue_max_frames))
-    input_q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=queue_max_frames * 4)
-    out_by_role: dict[Role, asyncio.Queue[bytes]] = {r: asyncio.Queue(maxsize=queue_max_frames) for r in roles}
+    batch_frames = max(1, int(args.batch_frames))
+    out_by_role: dict[Role, _FrameRing] = {r: _FrameRing(queue_max_frames, bytes_per_frame) for r in roles}
 
     device_id_base = str(args.device_id)
     device_id_by_role: dict[Role, str]
@@ -332,6 +590,33 @@ async def main() -> None:
     else:
         device_id_by_role = {roles[0]: device_id_base}
 
+    base = _esp32_audio_endpoint(str(args.server))
+    # role is one of two ASCII literals; only the user-supplied deviceId needs quoting.
+    uri_by_role: dict[Role, str] = {
+        role: f"{base}?deviceId={quote(device_id_by_role[role])}&role={role}" for role in roles
+    }
+
+    # Serialized once; resent verbatim on every reconnect. Sent as text: a binary message is audio.
+    hello_by_role: dict[Role, str] = {
+        role: json.dumps(
+            {
+                "v": 1,
+                "type": "hello",
+                "deviceId": device_id_by_role[role],
+                "role": role,
+                "fwVersion": "usb_relay",
+                "audio": {
+                    "format": "pcm_s16le",
+                    "sampleRateHz": audio_cfg.output_sample_rate_hz,
+                    "channels": 1,
+                    "frameMs": audio_cfg.frame_ms,
+                },
+            },
+            separators=(",", ":"),
+        )
+        for role in roles
+    }
+
     loop = asyncio.get_running_loop()
     stop_event = asyncio.Event()
     stop_flag = threading.Event()
@@ -349,29 +634,32 @@ async def main() -> None:
         except NotImplementedError:
             pass
 
-    def _enqueue_input(data: bytes) -> None:
-        if stop_flag.is_set():
-            return
-        if input_q.full():
-            try:
-                _ = input_q.get_nowait()
-            except asyncio.QueueEmpty:
-                pass
-        try:
-            input_q.put_nowait(data)
-        except asyncio.QueueFull:
-            pass
+    # Level is fixed after basicConfig; checked once so xrun storms at --log-level ERROR
+    # don't hop onto the loop just to be filtered out.
+    warn_status = log.isEnabledFor(logging.WARNING)
 
     def callback(indata, frames, time_info, status) -> None:  # type: ignore[no-untyped-def]
         if stop_flag.is_set():
             return
-        if status:
+        if status and warn_status:
             loop.call_soon_threadsafe(log.warning, "Audio status: %s", status)
-        loop.call_soon_threadsafe(_enqueue_input, bytes(indata))
+        capture.write(indata)
 
-    blocksize = int(audio_cfg.input_sample_rate_hz * (audio_cfg.frame_ms / 1000.0))
-    if blocksize <= 0:
+    frame_samples_in = int(audio_cfg.input_sample_rate_hz * (audio_cfg.frame_ms / 1000.0))
+    if frame_samples_in <= 0:
         raise SystemExit("Internal error: computed blocksize <= 0")
+    # Several frames per PortAudio callback: fewer callbacks/wakeups, still framed to frame_ms downstream.
+    blocksize = frame_samples_in * max(1, int(args.capture_block_frames))
+
+    # Same latency bound as before (queue_max_frames * 4 input frames), with headroom for bursts.
+    frame_bytes_in = frame_samples_in * audio_cfg.input_channels * 2
+    block_bytes = blocksize * audio_cfg.input_channels * 2
+    max_backlog = max(frame_bytes_in * queue_max_frames * 4, block_bytes * 2)
+    capture = _CaptureRing(
+        capacity=max_backlog * 2,
+        align=audio_cfg.input_channels * 2,
+        max_backlog=max_backlog,
+    )
 
     log.info(
         "Starting capture device=%s name=%s inputRate=%dHz inputCh=%d blocksize=%d outputRate=%dHz frameMs=%d",
@@ -384,22 +672,48 @@ async def main() -> None:
         audio_cfg.frame_ms,
     )
 
-    tasks: list[asyncio.Task[None]] = []
-    tasks.append(
-        asyncio.create_task(
-            _audio_process_loop(input_q=input_q, out_by_role=out_by_role, cfg=audio_cfg, role_mode=role_mode),
-            name="audio_process",
-        )
+    emit_output = functools.partial(
+        _frame_output,
+        # One lookup per role and chunk; the splitter only ever emits active roles.
+        sinks={r: (_ChunkBuffer(), out_by_role[r]) for r in roles},
+        bytes_per_frame=bytes_per_frame,
     )
+
+    def _emit(chunks: list[tuple[Role, bytes]]) -> None:
+        loop.call_soon_threadsafe(emit_output, chunks)
+
+    def _on_dsp_crash(exc: BaseException) -> None:
+        nonlocal fatal_exc
+        if stop_flag.is_set():
+            return
+        fatal_exc = exc
+        tb = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+        log.error("Audio DSP thread crashed\n%s", tb.rstrip())
+        _request_stop()
+
+    def _dsp_main() -> None:
+        try:
+            _audio_dsp_loop(capture=capture, cfg=audio_cfg, role_mode=role_mode, emit=_emit, stop_flag=stop_flag)
+        except BaseException as e:
+            if not stop_flag.is_set():
+                loop.call_soon_threadsafe(_on_dsp_crash, e)
+
+    # Resampling is CPU work; keep it off the loop so it never delays WS I/O.
+    dsp_thread = threading.Thread(target=_dsp_main, name="audio_dsp", daemon=True)
+    dsp_thread.start()
+
+    tasks: list[asyncio.Task[None]] = []
     for role in roles:
         tasks.append(
             asyncio.create_task(
                 _ws_sender(
-                    server=str(args.server),
+                    uri=uri_by_role[role],
                     role=role,
                     device_id=device_id_by_role[role],
-                    audio=audio_cfg,
-                    q=out_by_role[role],
+                    hello=hello_by_role[role],
+                    ring=out_by_role[role],
+                    frame_bytes=bytes_per_frame,
+                    batch_frames=batch_frames,
                 ),
                 name=f"ws_sender_{role}",
             )
@@ -438,9 +752,16 @@ async def main() -> None:
         for t in tasks:
             t.cancel()
         await asyncio.gather(*tasks, return_exceptions=True)
+        dsp_thread.join(timeout=1.0)
         if fatal_exc is not None:
             raise SystemExit(1)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        # Faster loop for the threadsafe DSP handoffs and socket writes (requirements.txt, non-Windows).
+        uvloop.run(main())